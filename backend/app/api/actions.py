@@ -0,0 +1,28 @@
+import random
+import time
+from typing import Any, Dict, List
+
+# Built-in actions for API-submitted tasks. They live at module level (not as
+# closures in main.py) so tasks can be pickled into the durable task queue and
+# executed by worker processes without importing the API app.
+
+def simulated_action(ctx, cfg: Dict[str, Any]) -> str:
+    # Sim different durations
+    duration = random.uniform(0.5, 2.0)
+    ctx.log.info("Simulating work for %.2fs", duration)
+    time.sleep(duration)
+    if random.random() < 0.1: # 10% fail chance
+        raise Exception("Random Failure")
+    return f"Processed {cfg.get('name')}"
+
+def branch_action(ctx, cfg: Dict[str, Any]) -> List[str]:
+    return cfg.get('params', {}).get('next', [])
+
+def noop_action(ctx, cfg: Dict[str, Any]) -> str:
+    return "OK"
+
+def map_action(ctx, cfg: Dict[str, Any], chunk: List[Any]) -> List[str]:
+    return [f"Processed {item}" for item in chunk]
+
+def collect_reduce(ctx, cfg: Dict[str, Any], chunk_results: List[List[Any]]) -> List[Any]:
+    return [item for chunk in chunk_results for item in chunk]
@@ -1,12 +1,14 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from typing import List, Dict, Optional, Any
 from enum import Enum
 from datetime import datetime
+from app.core.triggers import TriggerRule
 
 class TaskType(str, Enum):
     PYTHON = "python"
     HTTP = "http"
     BRANCH = "branch"
+    MAP = "map"
 
 class TaskStatusState(str, Enum):
     PENDING = "pending"
@@ -14,6 +16,7 @@ class TaskStatusState(str, Enum):
     COMPLETED = "completed"
     FAILED = "failed"
     SKIPPED = "skipped"
+    UPSTREAM_FAILED = "upstream_failed"
     WAITING_APPROVAL = "waiting_approval"
 
 class TaskConfig(BaseModel):
@@ -22,6 +25,20 @@ class TaskConfig(BaseModel):
     params: Dict[str, Any] = {}
     dependencies: List[str] = []
 
+    @model_validator(mode="after")
+    def check_params(self):
+        # Params the task constructors parse; rejected here as 422 instead of failing at build time
+        rule = self.params.get("trigger_rule")
+        if rule is not None and rule not in {r.value for r in TriggerRule}:
+            raise ValueError(f"trigger_rule must be one of {[r.value for r in TriggerRule]}, got {rule!r}")
+        if self.type == TaskType.MAP:
+            for key in ("chunk_size", "parallelism"):
+                value = self.params.get(key, 1)
+                # Whole numbers only (MappedTask applies int()); "4" is accepted, 2.5 and True are not
+                if type(value) not in (int, str) or not str(value).isdigit() or int(value) < 1:
+                    raise ValueError(f"{key} must be a positive integer, got {value!r}")
+        return self
+
 class WorkflowCreateRequest(BaseModel):
     id: str
     name: str
@@ -30,6 +47,24 @@ class WorkflowCreateRequest(BaseModel):
     tags: List[str] = []
     owner: str
     tasks: List[TaskConfig]
+    # Scheduling priority band; higher runs first (e.g. interactive > backfill)
+    priority: int = 0
+    # Re-run only tasks changed since the last successful execution (and their dependents)
+    incremental: bool = False
+
+class BatchExecutionItem(BaseModel):
+    # Refers to a definition in the same batch or an already registered workflow
+    workflowId: str
+    params: Dict[str, Any] = {}
+
+class WorkflowBatchRequest(BaseModel):
+    definitions: List[WorkflowCreateRequest] = []
+    executions: List[BatchExecutionItem]
+
+class WorkflowBatchResponse(BaseModel):
+    executionIds: List[str]
+    rejected: int = 0
+    retryAfter: Optional[int] = None
 
 class TaskResult(BaseModel):
     id: str
@@ -52,6 +87,17 @@ class WorkflowExecutionModel(BaseModel):
     duration: Optional[float] = None
     environment: str = "production"
     triggeredBy: str = "manual"
+    params: Dict[str, Any] = {}
+
+class TaskLogEntry(BaseModel):
+    timestamp: datetime
+    level: str
+    message: str
+
+class TaskLogsResponse(BaseModel):
+    executionId: str
+    task: str
+    lines: List[TaskLogEntry]
 
 class WorkflowModel(BaseModel):
     id: str
@@ -61,5 +107,7 @@ class WorkflowModel(BaseModel):
     owner: str
     tags: List[str]
     tasks: List[TaskConfig]
+    priority: int = 0
+    incremental: bool = False
     createdAt: datetime
     updatedAt: datetime
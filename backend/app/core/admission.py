@@ -0,0 +1,140 @@
+import asyncio
+import math
+import time
+from collections import deque, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when the admission queue is full. Carries a Retry-After hint in seconds.
+    """
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class AdmissionTicket:
+    execution_id: str
+    owner: str
+    tags: List[str] = field(default_factory=list)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class AdmissionController:
+    """
+    Admission control for workflow runs.
+    Bounds concurrent runs globally, per owner and per tag, and parks the excess in a
+    bounded FIFO queue. A ticket blocked by its own quota does not block tickets of
+    other owners behind it (no head-of-line blocking across tenants).
+    """
+    def __init__(self,
+                 max_concurrent_runs: int = 50,
+                 max_queue_depth: int = 1000,
+                 owner_quota: Optional[int] = None,
+                 tag_quotas: Optional[Dict[str, int]] = None,
+                 history_size: int = 500):
+        self.max_concurrent_runs = max_concurrent_runs
+        self.max_queue_depth = max_queue_depth
+        self.owner_quota = owner_quota
+        self.tag_quotas = tag_quotas or {}
+        self._queue: Deque[tuple] = deque()
+        self._running = 0
+        self._running_by_owner: Dict[str, int] = defaultdict(int)
+        self._running_by_tag: Dict[str, int] = defaultdict(int)
+        # Recent samples for metrics and Retry-After estimation
+        self._waits: Deque[float] = deque(maxlen=history_size)
+        self._durations: Deque[float] = deque(maxlen=history_size)
+        self.admitted_total = 0
+        self.rejected_total = 0
+
+    def _fits(self, ticket: AdmissionTicket) -> bool:
+        if self._running >= self.max_concurrent_runs:
+            return False
+        if self.owner_quota is not None and self._running_by_owner[ticket.owner] >= self.owner_quota:
+            return False
+        for tag in ticket.tags:
+            limit = self.tag_quotas.get(tag)
+            if limit is not None and self._running_by_tag[tag] >= limit:
+                return False
+        return True
+
+    def retry_after(self) -> int:
+        """Rough seconds until a queue slot frees up, based on recent run durations."""
+        if not self._durations:
+            return 1
+        avg = sum(self._durations) / len(self._durations)
+        drain = avg * len(self._queue) / max(self.max_concurrent_runs, 1)
+        return max(1, min(300, math.ceil(drain)))
+
+    def submit(self, ticket: AdmissionTicket, run_factory: Callable[[], Awaitable[Any]], force: bool = False):
+        """
+        Queues a run for admission. run_factory is only called once the run is admitted.
+        Raises AdmissionRejected when the queue is full, unless force is set (used for recovery).
+        """
+        if not force and len(self._queue) >= self.max_queue_depth:
+            self.rejected_total += 1
+            raise AdmissionRejected(
+                f"Admission queue full ({self.max_queue_depth} runs waiting)", self.retry_after()
+            )
+        self._queue.append((ticket, run_factory))
+        self._pump()
+
+    def _pump(self):
+        if not self._queue or self._running >= self.max_concurrent_runs:
+            return
+        waiting = deque()
+        while self._queue:
+            ticket, run_factory = self._queue.popleft()
+            if self._running < self.max_concurrent_runs and self._fits(ticket):
+                self._admit(ticket, run_factory)
+            else:
+                waiting.append((ticket, run_factory))
+        self._queue = waiting
+
+    def _admit(self, ticket: AdmissionTicket, run_factory: Callable[[], Awaitable[Any]]):
+        self._running += 1
+        self._running_by_owner[ticket.owner] += 1
+        for tag in ticket.tags:
+            self._running_by_tag[tag] += 1
+        self.admitted_total += 1
+        self._waits.append(time.monotonic() - ticket.enqueued_at)
+        asyncio.create_task(self._run(ticket, run_factory))
+
+    async def _run(self, ticket: AdmissionTicket, run_factory: Callable[[], Awaitable[Any]]):
+        started = time.monotonic()
+        try:
+            await run_factory()
+        finally:
+            self._durations.append(time.monotonic() - started)
+            self._release(ticket)
+
+    def _release(self, ticket: AdmissionTicket):
+        self._running -= 1
+        self._running_by_owner[ticket.owner] -= 1
+        if not self._running_by_owner[ticket.owner]:
+            del self._running_by_owner[ticket.owner]
+        for tag in ticket.tags:
+            self._running_by_tag[tag] -= 1
+            if not self._running_by_tag[tag]:
+                del self._running_by_tag[tag]
+        self._pump()
+
+    def metrics(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        waits = sorted(self._waits)
+        return {
+            "running": self._running,
+            "max_concurrent_runs": self.max_concurrent_runs,
+            "queue_depth": len(self._queue),
+            "max_queue_depth": self.max_queue_depth,
+            "oldest_wait_seconds": (now - self._queue[0][0].enqueued_at) if self._queue else 0.0,
+            "avg_wait_seconds": (sum(waits) / len(waits)) if waits else 0.0,
+            "p95_wait_seconds": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+            "running_by_owner": dict(self._running_by_owner),
+            "running_by_tag": dict(self._running_by_tag),
+            "admitted_total": self.admitted_total,
+            "rejected_total": self.rejected_total,
+        }
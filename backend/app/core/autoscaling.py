@@ -0,0 +1,84 @@
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional
+
+
+@dataclass
+class ScalingPolicy:
+    """
+    Bounds and thresholds for the worker-pool control loop.
+    The gap between scale_up_ratio and scale_down_ratio is the hysteresis band;
+    separate cooldowns keep the pool from flapping (grow fast, shrink slowly).
+    """
+    min_workers: int = 2
+    max_workers: int = 10
+    # Pending tasks per worker ("TasksPerWorker" in SCALING.md)
+    scale_up_ratio: float = 5.0
+    scale_down_ratio: float = 1.0
+    # Shrink only while average utilization (running / pool size) stays below this
+    scale_down_utilization: float = 0.5
+    cooldown_up: float = 5.0
+    cooldown_down: float = 30.0
+    interval: float = 1.0
+    utilization_window: int = 10
+
+
+class PoolAutoscaler:
+    """
+    Control loop resizing a LocalExecutionBackend's pool between the policy's bounds.
+    Samples pending tasks per worker and recent utilization every interval; grows by
+    doubling under backlog and shrinks by a quarter when the pool sits mostly idle.
+    """
+    def __init__(self, backend, policy: ScalingPolicy):
+        self.backend = backend
+        self.policy = policy
+        self._utilization: Deque[float] = deque(maxlen=policy.utilization_window)
+        self._last_resize = float("-inf")
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=100)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def decide(self, size: int, pending: int, running: int, now: float) -> Optional[int]:
+        """Returns the new pool size, or None to keep the current one."""
+        p = self.policy
+        self._utilization.append(running / size if size else 1.0)
+        # An empty pool (min_workers=0) grows only once something is waiting
+        tasks_per_worker = pending / size if size else (float("inf") if pending else 0.0)
+        since = now - self._last_resize
+
+        if tasks_per_worker > p.scale_up_ratio and size < p.max_workers and since >= p.cooldown_up:
+            return min(p.max_workers, max(size + 1, size * 2))
+
+        avg_util = sum(self._utilization) / len(self._utilization)
+        if (tasks_per_worker < p.scale_down_ratio and avg_util < p.scale_down_utilization
+                and size > p.min_workers and since >= p.cooldown_down
+                and len(self._utilization) == self._utilization.maxlen):
+            return max(p.min_workers, size - max(1, math.ceil(size / 4)))
+        return None
+
+    def tick(self, now: Optional[float] = None) -> Optional[int]:
+        now = time.monotonic() if now is None else now
+        size, pending, running = self.backend.load()
+        new_size = self.decide(size, pending, running, now)
+        if new_size is not None and new_size != size:
+            self._last_resize = now
+            # Fresh window after a resize so shrink decisions reflect the new size
+            self._utilization.clear()
+            event = {"from": size, "to": new_size, "pending": pending, "running": running, "at": time.time()}
+            self.history.append(event)
+            self.backend.resize(new_size, event)
+        return new_size
+
+    def _loop(self):
+        while not self._stop.wait(self.policy.interval):
+            self.tick()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, name="pool-autoscaler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
@@ -1,7 +1,15 @@
 from concurrent.futures import ThreadPoolExecutor, Future
+import logging
+import threading
 import time
-from typing import Any
+from typing import Any, Dict, Optional
 from app.interfaces import ExecutionBackend, Task
+from app.core.scheduling import FairShareQueue
+from app.core.autoscaling import PoolAutoscaler, ScalingPolicy
+from app.core.patterns import Subject
+from app.core.logs import TASK_LOGGER, bind_task, log_name
+
+task_logger = logging.getLogger(TASK_LOGGER)
 
 class ConnectionPool:
     """
@@ -25,31 +33,146 @@ class ConnectionPool:
             self._active.remove(conn)
             self._connections.append(conn)
 
-class LocalExecutionBackend(ExecutionBackend):
+class LocalExecutionBackend(ExecutionBackend, Subject):
     """
     Concrete Strategy for Local Execution.
     Demonstrates resource handling with ConnectionPool.
+
+    Submissions wait in a FairShareQueue (priority bands, weighted DRR across
+    tenants) and are handed to the thread pool only when a worker is free, so
+    the pool's own FIFO never decides who runs next.
+
+    With a ScalingPolicy the pool size floats between the policy's bounds under a
+    PoolAutoscaler; every resize is notified to observers as "pool_resized".
     """
-    def __init__(self, max_workers: int = 5):
+    def __init__(self, max_workers: int = 5, tenant_weights: Optional[Dict[str, float]] = None,
+                 scaling: Optional[ScalingPolicy] = None):
+        Subject.__init__(self)
+        if scaling:
+            max_workers = scaling.max_workers
+        self.max_workers = max_workers
+        # Current dispatch capacity; fixed at max_workers unless autoscaling
+        self.pool_size = scaling.min_workers if scaling else max_workers
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
-        self.db_pool = ConnectionPool(pool_size=10)
+        self.db_pool = ConnectionPool(pool_size=max(10, max_workers))
+        self._queue = FairShareQueue(tenant_weights)
+        self._lock = threading.Lock()
+        self._running = 0
+        self.autoscaler: Optional[PoolAutoscaler] = None
+        if scaling:
+            self.autoscaler = PoolAutoscaler(self, scaling)
+            self.autoscaler.start()
+
+    def submit_task(self, task: Task, priority: int = 0, tenant: Optional[str] = None, context: Any = None) -> Future:
+        future = Future()
+        with self._lock:
+            self._queue.push((self._execute_wrapper, (task, context), future), priority, tenant or "default")
+        self._dispatch()
+        return future
+
+    def submit_batch(self, tasks, priority: int = 0, tenant: Optional[str] = None, context: Any = None) -> Future:
+        # One queue entry, one worker slot and one pool submission for the whole batch
+        future = Future()
+        with self._lock:
+            self._queue.push((self._execute_batch, (tasks, context), future), priority, tenant or "default")
+        self._dispatch()
+        return future
+
+    def _dispatch(self):
+        while True:
+            with self._lock:
+                if self._running >= self.pool_size or not len(self._queue):
+                    return
+                fn, args, future = self._queue.pop()
+                self._running += 1
+            if not future.set_running_or_notify_cancel():
+                with self._lock:
+                    self._running -= 1
+                continue
+            # Wrapping execution to include resource acquisition
+            inner = self.executor.submit(fn, *args)
+            inner.add_done_callback(lambda f, outer=future: self._on_done(f, outer))
 
-    def submit_task(self, task: Task) -> Future:
-        # Wrapping execution to include resource acquisition
-        return self.executor.submit(self._execute_wrapper, task)
+    def _on_done(self, inner: Future, outer: Future):
+        with self._lock:
+            self._running -= 1
+        # Hand the freed worker to the next queued task before waking the caller
+        self._dispatch()
+        exc = inner.exception()
+        if exc is not None:
+            outer.set_exception(exc)
+        else:
+            outer.set_result(inner.result())
 
-    def _execute_wrapper(self, task: Task) -> Any:
+    def load(self) -> tuple:
+        """(pool size, pending, running) sample for the autoscaler."""
+        with self._lock:
+            return self.pool_size, len(self._queue), self._running
+
+    def resize(self, new_size: int, event: Optional[Dict[str, Any]] = None):
+        # Shrinking never interrupts running tasks; it just stops dispatching past the new size
+        # Only an autoscaler with min_workers=0 may take the pool down to zero
+        floor = self.autoscaler.policy.min_workers if self.autoscaler else 1
+        with self._lock:
+            self.pool_size = max(floor, min(new_size, self.max_workers))
+        self.notify("pool_resized", event or {"to": self.pool_size})
+        self._dispatch()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = {
+                "workers": self.pool_size,
+                "max_workers": self.max_workers,
+                "running": self._running,
+                "pending": len(self._queue),
+                # The autoscaler may shrink the pool to zero (min_workers=0)
+                "tasks_per_worker": len(self._queue) / max(self.pool_size, 1),
+                "utilization": self._running / max(self.pool_size, 1),
+                "pending_by_priority": self._queue.depth_by_priority(),
+                "pending_by_tenant": self._queue.depth_by_tenant(),
+            }
+        if self.autoscaler:
+            metrics["min_workers"] = self.autoscaler.policy.min_workers
+            metrics["resizes"] = list(self.autoscaler.history)[-10:]
+        return metrics
+
+    def _execute_wrapper(self, task: Task, context: Any = None) -> Any:
         conn = None
         try:
             # Custom Context Manager could be used here
             conn = self.db_pool.get_connection()
             # print(f"[{task.name}] Acquired {conn}")
             
-            # Context construction logic would be in Engine, but simulating passing down:
-            from app.core.task import TaskContext
-            ctx = TaskContext(workflow_id="local", run_id=f"run_{int(time.time())}")
+            # Context is built by the Engine; fall back to a local one for direct submissions
+            if context is None:
+                from app.core.task import TaskContext
+                context = TaskContext(workflow_id="local", run_id=f"run_{int(time.time())}")
             
-            return task.execute(ctx)
+            with bind_task(context.workflow_id, log_name(task)):
+                try:
+                    return task.execute(context)
+                except Exception as e:
+                    task_logger.error("Task %s failed: %s", task.name, e)
+                    raise
         finally:
             if conn:
                 self.db_pool.release_connection(conn)
+
+    def _execute_batch(self, tasks, context: Any = None) -> list:
+        """Runs a micro-batch back to back on one worker with one pooled connection."""
+        conn = self.db_pool.get_connection()
+        try:
+            if context is None:
+                from app.core.task import TaskContext
+                context = TaskContext(workflow_id="local", run_id=f"run_{int(time.time())}")
+            outcomes = []
+            for task in tasks:
+                with bind_task(context.workflow_id, log_name(task)):
+                    try:
+                        outcomes.append((True, task.execute(context)))
+                    except Exception as e:
+                        task_logger.error("Task %s failed: %s", task.name, e)
+                        outcomes.append((False, e))
+            return outcomes
+        finally:
+            self.db_pool.release_connection(conn)
@@ -0,0 +1,233 @@
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+_HEADER = struct.Struct("<d")  # expires_at (0 = never)
+
+
+class BlobStore:
+    """
+    Directory of immutable, content-addressed blobs.
+    Writes are atomic (temp file + rename); reads go through a read-only mmap so
+    large payloads are not copied into a bytes object before use.
+    """
+    def __init__(self, root: str, max_bytes: Optional[int] = None):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        # key -> size, oldest first, for disk-size bounding
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        entries = []
+        for name in os.listdir(root):
+            if name.endswith(".blob"):
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, name[:-5], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+        self.total_bytes = sum(self._index.values())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.blob")
+
+    def put(self, key: str, data: bytes, header: bytes = b"") -> str:
+        path = self._path(key)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(data)
+        os.replace(tmp, path)
+        size = len(header) + len(data)
+        with self._lock:
+            self.total_bytes += size - self._index.pop(key, 0)
+            self._index[key] = size
+            while self.max_bytes is not None and self.total_bytes > self.max_bytes and len(self._index) > 1:
+                old_key, old_size = self._index.popitem(last=False)
+                self.total_bytes -= old_size
+                self._unlink(old_key)
+        return path
+
+    def open(self, key: str) -> Optional[mmap.mmap]:
+        """Returns a read-only mmap of the blob, or None if it does not exist."""
+        try:
+            with open(self._path(key), "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+
+    def delete(self, key: str):
+        with self._lock:
+            self.total_bytes -= self._index.pop(key, 0)
+        self._unlink(key)
+
+    def _unlink(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+_CONSTANT_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+def _hash_code(h, code):
+    h.update(code.co_code)
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _hash_code(h, const)  # nested function or comprehension
+        else:
+            h.update(repr(const).encode())
+
+
+def _hash_action(h, action):
+    """
+    Identifies an action by name and by its code, so two lambdas (or two versions
+    of one function) never share a key. Default arguments and constants captured
+    by a closure are part of the key; other captured objects only by type.
+    """
+    h.update(f"{getattr(action, '__module__', '')}.{getattr(action, '__qualname__', '')}".encode())
+    code = getattr(action, '__code__', None)
+    if code is None:
+        return
+    _hash_code(h, code)
+    h.update(repr(getattr(action, '__defaults__', None)).encode())
+    for cell in getattr(action, '__closure__', None) or ():
+        try:
+            value = cell.cell_contents
+        except ValueError:  # empty cell
+            continue
+        h.update(repr(value).encode() if isinstance(value, _CONSTANT_TYPES) else type(value).__qualname__.encode())
+
+
+class ResultCache:
+    """
+    Content-addressed task result cache with two tiers:
+    - memory: LRU bounded by the pickled size of its entries
+    - disk (optional): BlobStore of pickled results, read back via mmap
+    Keys hash the task type, action, name, params and upstream results, so a task
+    is only skipped when everything that could change its output is unchanged.
+    """
+    def __init__(self, memory_bytes: int = 64 * 1024 * 1024, disk_dir: Optional[str] = None,
+                 ttl: Optional[float] = None, disk_bytes: Optional[int] = None):
+        self.memory_bytes = memory_bytes
+        self.ttl = ttl
+        self.disk = BlobStore(disk_dir, disk_bytes) if disk_dir else None
+        self._memory: "OrderedDict[str, Tuple[float, Any, int]]" = OrderedDict()
+        self._memory_used = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key_for(task, upstream_results: Dict[str, Any], global_params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Returns the cache key for a task, or None if its inputs cannot be hashed."""
+        try:
+            h = hashlib.sha256()
+            h.update(getattr(task, 'type_name', type(task).__name__).encode())
+            _hash_action(h, getattr(task, 'action', None))
+            h.update(task.name.encode())
+            h.update(json.dumps(task.params, sort_keys=True, default=repr).encode())
+            # Run-level params reach the action through the context, so they are inputs too
+            h.update(json.dumps(global_params or {}, sort_keys=True, default=repr).encode())
+            h.update(pickle.dumps(sorted(upstream_results.items()), protocol=pickle.HIGHEST_PROTOCOL))
+            return h.hexdigest()
+        except Exception:
+            return None
+
+    def _expiry(self) -> float:
+        return time.time() + self.ttl if self.ttl else 0.0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires, value, size = entry
+                if not expires or expires > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                self._evict(key)
+        if self.disk is not None:
+            blob = self.disk.open(key)
+            if blob is not None:
+                with blob:
+                    expires, = _HEADER.unpack_from(blob)
+                    if not expires or expires > now:
+                        with memoryview(blob) as view, view[_HEADER.size:] as payload:
+                            value = pickle.loads(payload)
+                        with self._lock:
+                            self.hits += 1
+                            self.disk_hits += 1
+                        # Promote to the memory tier
+                        self._remember(key, value, blob.size() - _HEADER.size, expires)
+                        return True, value
+                self.disk.delete(key)
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def put(self, key: str, value: Any, pickled: Optional[bytes] = None):
+        """pickled: the value already pickled by the caller, reused instead of pickling again."""
+        if pickled is not None:
+            data = pickled
+        else:
+            try:
+                data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                return
+        expires = self._expiry()
+        self._remember(key, value, len(data), expires)
+        if self.disk is not None:
+            self.disk.put(key, data, _HEADER.pack(expires))
+
+    def _remember(self, key: str, value: Any, size: int, expires: float):
+        if size > self.memory_bytes:
+            return
+        with self._lock:
+            if key in self._memory:
+                self._evict(key)
+            self._memory[key] = (expires, value, size)
+            self._memory_used += size
+            while self._memory_used > self.memory_bytes:
+                self._evict(next(iter(self._memory)))
+                self.evictions += 1
+
+    def _evict(self, key: str):
+        _, _, size = self._memory.pop(key)
+        self._memory_used -= size
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_used,
+                "memory_limit_bytes": self.memory_bytes,
+                "evictions": self.evictions,
+                "disk_entries": len(self.disk) if self.disk is not None else 0,
+                "disk_bytes": self.disk.total_bytes if self.disk is not None else 0,
+            }
@@ -1,4 +1,4 @@
-from typing import List, Dict, Set
+from typing import Any, List, Dict, Optional, Set
 from app.interfaces import WorkflowDAG, Task
 
 class SimpleWorkflowDAG(WorkflowDAG):
@@ -6,6 +6,16 @@ class SimpleWorkflowDAG(WorkflowDAG):
         self.workflow_id = workflow_id
         self.tasks: Dict[str, Task] = {}
         self.dependencies: Dict[str, Set[str]] = {} # Parent -> Children
+        # Free-form run metadata (e.g. the originating request), journaled at run start
+        self.metadata: Dict[str, Any] = {}
+        # Run-level parameters, exposed to tasks as TaskContext.global_params
+        self.params: Dict[str, Any] = {}
+        # Scheduling hints for the backend: priority band and fair-share tenant key
+        self.priority: int = 0
+        self.tenant: Optional[str] = None
+        # Incremental re-runs: outputs carried over from a previous run, by task name.
+        # These tasks complete without executing (see app.core.incremental).
+        self.reuse: Dict[str, Any] = {}
 
     def add_task(self, task: Task):
         self.tasks[task.name] = task
@@ -17,6 +27,17 @@ class SimpleWorkflowDAG(WorkflowDAG):
         self.add_task(child)
         self.dependencies[parent.name].add(child.name)
 
+    def downstream_closure(self, names: Set[str]) -> Set[str]:
+        """Returns the given tasks plus everything reachable from them."""
+        closure = {n for n in names if n in self.tasks}
+        stack = list(closure)
+        while stack:
+            for child in self.dependencies.get(stack.pop(), ()):
+                if child not in closure:
+                    closure.add(child)
+                    stack.append(child)
+        return closure
+
     def get_roots(self) -> List[Task]:
         # Nodes with no incoming edges? No, strict definition.
         # But here dependencies map is Parent -> Children.
@@ -1,10 +1,17 @@
 import asyncio
-from typing import Dict, Any, List
+from collections import deque
+from typing import Deque, Dict, Any, List, Optional
 from functools import lru_cache
 from app.interfaces import WorkflowEngine, ExecutionBackend
 from app.core.dag import SimpleWorkflowDAG
+from app.core.journal import RunJournal, JournalState
+from app.core.cache import ResultCache
+from app.core.results import ResultStore, ResultHandle, dumps
 from app.core.task import TaskContext
-from app.core.patterns import Subject, Observer, ExecuteTaskCommand, WorkflowState, RunningState, PausedState
+from app.core import triggers
+from app.core.triggers import TriggerRule
+from app.core.run_state import RunState, RunSummary
+from app.core.patterns import Subject, Observer, ExecuteTaskCommand
 from app.interfaces import WorkflowResult, TaskStatus
 
 class AdvancedWorkflowEngine(WorkflowEngine, Subject):
@@ -14,120 +21,466 @@ class AdvancedWorkflowEngine(WorkflowEngine, Subject):
     - Observer (Inherits Subject)
     - State (Manages WorkflowState)
     - Command (Executes Tasks)
+
+    With a RunJournal attached, every completion and branch decision is journaled
+    and a re-run of the same workflow id resumes from the unfinished frontier.
+    max_active_tasks bounds the number of tasks in flight across all runs of this engine.
+    batch_size opts into micro-batching: ready tasks marked cheap are grouped into
+    one backend submission of up to batch_size tasks, run back to back. Each member
+    holds one of the max_active_tasks slots, so a batch is also capped by free slots.
+    With a ResultCache, a task whose type, params and upstream results were seen
+    before is not dispatched; its cached result completes it ("task_cached").
+    Each task gets its own TaskContext whose task_results holds ResultHandles for its
+    parents' outputs; with a spilling ResultStore, large results stay on disk until read.
+    Tasks listed in dag.reuse complete with their carried-over output and are never dispatched.
+    Each task's trigger_rule decides whether it runs, is skipped or is marked
+    upstream_failed once its parents settle; a run with failures ends FAILED.
+    All per-run state lives in a RunState registered only while the run is active;
+    finished runs leave a RunSummary in the bounded recent_runs history. memory_budget
+    caps inline result bytes across live runs by spilling the largest results.
     """
-    def __init__(self, backend: ExecutionBackend):
+    def __init__(self, backend: ExecutionBackend, journal: Optional[RunJournal] = None, max_active_tasks: Optional[int] = None,
+                 batch_size: Optional[int] = None, cache: Optional[ResultCache] = None,
+                 result_store: Optional[ResultStore] = None, memory_budget: Optional[int] = None,
+                 history_size: int = 1000):
         Subject.__init__(self)
         self.backend = backend
-        # State Pattern: Track state per workflow
-        self._states: Dict[str, WorkflowState] = {} 
-        self._results: Dict[str, Any] = {}
+        self.journal = journal
+        self.max_active_tasks = max_active_tasks
+        self._task_slots: Optional[asyncio.Semaphore] = asyncio.Semaphore(max_active_tasks) if max_active_tasks else None
+        self.active_tasks = 0
+        self.backpressure_delay = 0.1
+        self.batch_size = batch_size
+        self.cache = cache
+        # Default store never spills unless a memory budget needs it to
+        self.result_store = result_store or ResultStore(spill_threshold=None if memory_budget is None else 1024 * 1024)
+        self.memory_budget = memory_budget
+        self.spilled_under_pressure = 0
+        # Active runs by workflow id (State Pattern context per run)
+        self._runs: Dict[str, RunState] = {}
+        self.recent_runs: Deque[RunSummary] = deque(maxlen=history_size)
 
     @lru_cache(maxsize=100)
     def _get_cached_config(self, task_name: str):
         # Simulated LRU cache for frequent config access
         return {"timeout": 30, "retries": 3}
 
+    def _children_to_visit(self, dag: SimpleWorkflowDAG, task, res) -> tuple:
+        """
+        Returns (children to visit, children skipped by a branch decision).
+        """
+        children = dag.dependencies.get(task.name, set())
+        # Check if task is a Branching Task
+        # We discern via type or attribute. Let's use attribute "type_name" from registry
+        if getattr(task, 'type_name', '') == "branch_python_task":
+            # Result MUST be a list of task names
+            if not isinstance(res, list):
+                # Fail for safety
+                raise ValueError(f"Branch task {task.name} did not return a list of task names.")
+            allowed_next = set(res)
+            return ([c for c in children if c in allowed_next],
+                    [c for c in children if c not in allowed_next])
+        return list(children), []
+
+    async def _complete_batch(self, wf_id: str, batch: List, future: asyncio.Future, context, dag, complete, fail,
+                              store_result):
+        """
+        Processes a micro-batch: completions are journaled in one write and reported
+        as a single "task_batch_completed" event; failures are handled per task.
+        """
+        try:
+            outcomes = future.result()
+        except Exception as e:
+            outcomes = [(False, e)] * len(batch)
+        completed = []
+        for task, (ok, value) in zip(batch, outcomes):
+            if ok:
+                try:
+                    complete(task, value, completed, stored=await store_result(task, value))
+                    continue
+                except Exception as e:
+                    value = e
+            await fail(task, value, ExecuteTaskCommand(task, context, self.backend, dag.priority, dag.tenant or wf_id))
+        if completed:
+            # The pickled payloads are for the journal only, not for observers
+            pickled = [c.pop("pickled") for c in completed]
+            if self.journal:
+                self.journal.tasks_completed(wf_id, [(c["task"], c["result"]) for c in completed], pickled)
+            self.notify("task_batch_completed", {"workflow_id": wf_id, "tasks": completed})
+
+    async def _run_mapped(self, wf_id: str, task, upstream: Optional[ResultHandle], context, dag) -> Any:
+        """
+        Runs a MappedTask: keeps at most task.parallelism instances in flight and only
+        creates the next instance when one finishes, then reduces the results in order.
+        Instances count against max_active_tasks: the first one runs in the mapped
+        task's own slot, every further one takes a slot of its own (without waiting
+        for it, so a map can never starve itself).
+        """
+        if not task.validate():
+            raise ValueError(f"Mapped task {task.name} needs an action, an upstream and a positive "
+                             f"chunk_size and parallelism")
+        if upstream is None:
+            raise ValueError(f"Mapped task {task.name}: upstream {task.upstream!r} is not one of its parents")
+        items = upstream.get()
+        if not isinstance(items, list):
+            raise TypeError(f"Mapped task {task.name} expects a list from {task.upstream!r}, "
+                            f"got {type(items).__name__}")
+        instances = task.expand(items)
+        chunk_results: Dict[int, Any] = {}
+        # future -> (instance index, whether it holds an extra task slot)
+        pending: Dict[asyncio.Future, tuple] = {}
+        error: Optional[Exception] = None
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and error is None and len(pending) < task.parallelism:
+                    extra_slot = bool(pending) and self._task_slots is not None
+                    if extra_slot:
+                        if self._task_slots.locked():
+                            break
+                        await self._task_slots.acquire()
+                    instance = next(instances, None)
+                    if instance is None:
+                        if extra_slot:
+                            self._task_slots.release()
+                        exhausted = True
+                        break
+                    future = asyncio.wrap_future(
+                        self.backend.submit_task(instance, dag.priority, dag.tenant or wf_id, context)
+                    )
+                    pending[future] = (instance.index, extra_slot)
+                if not pending:
+                    break
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    index, extra_slot = pending.pop(future)
+                    if extra_slot:
+                        self._task_slots.release()
+                    try:
+                        chunk_results[index] = future.result()
+                    except Exception as e:
+                        # Stop expanding; let in-flight instances drain, then fail the mapped task
+                        error = error or e
+        finally:
+            for _, extra_slot in pending.values():
+                if extra_slot:
+                    self._task_slots.release()
+        if error is not None:
+            raise error
+        self.notify("task_mapped", {"workflow_id": wf_id, "task": task.name, "instances": len(chunk_results)})
+        return task.reduce_results(context, [chunk_results[i] for i in range(len(chunk_results))])
+
+    def _enforce_memory_budget(self):
+        """Spills inline results of the largest live runs until the budget holds."""
+        total = sum(r.result_bytes for r in self._runs.values())
+        if total <= self.memory_budget:
+            return
+        for run in sorted(self._runs.values(), key=lambda r: r.result_bytes, reverse=True):
+            excess = total - self.memory_budget
+            if excess <= 0:
+                break
+            freed = run.spill(self.result_store, max(0, run.result_bytes - excess))
+            total -= freed
+            self.spilled_under_pressure += freed
+
     async def run(self, dag: SimpleWorkflowDAG) -> WorkflowResult:
         wf_id = dag.workflow_id
-        self._states[wf_id] = RunningState()
-        
-        # Context creation
-        context = TaskContext(wf_id, f"run_{id(self)}", {})
+        run = RunState(wf_id, f"run_{id(self)}", dag.tasks)
+        self._runs[wf_id] = run
+        try:
+            return await self._execute(dag, run)
+        finally:
+            # Release everything the run held; only its summary outlives it
+            if self._runs.get(wf_id) is run:
+                del self._runs[wf_id]
+
+    async def _execute(self, dag: SimpleWorkflowDAG, run: RunState) -> WorkflowResult:
+        wf_id = dag.workflow_id
+        # Context creation (per-task contexts share the run id and params)
+        run_id = run.run_id
+        global_params = dict(dag.params)
+        context = TaskContext(wf_id, run_id, global_params)
+
+        replayed = self.journal.replay(wf_id) if self.journal else None
+        if self.journal and not replayed.started:
+            self.journal.run_started(wf_id, getattr(dag, 'metadata', None))
         
         # Notify Observers
         self.notify("workflow_started", {"id": wf_id})
 
         # Command Pattern & Async Execution
-        # Simplified Topological Sort Execution
-        in_degree = {name: 0 for name in dag.tasks}
+        # Topological execution with per-task upstream counters: every edge is settled
+        # exactly once, so skip and failure propagation is O(V+E) for the whole run
+        in_degree, parents, counts = run.in_degree, run.parents, run.counts
+        decided, outcomes, queue, cheap = run.decided, run.outcomes, run.ready, run.ready_cheap
+        # Results are held as handles; spilled ones cost only their key in memory
+        handles, cache_keys = run.handles, run.cache_keys
+        store = self.result_store
         for parent, children in dag.dependencies.items():
             for child in children:
                 in_degree[child] += 1
-                
-        queue = [dag.tasks[name] for name, deg in in_degree.items() if deg == 0]
-        results = {}
-
-        while queue:
-            # check state
-            if isinstance(self._states[wf_id], PausedState):
-                await asyncio.sleep(1)
+                parents[child].append(parent)
+
+        def make_ready(task):
+            # Cheap tasks wait apart while micro-batching, so batches never rescan the ready queue
+            (cheap if self.batch_size and getattr(task, 'cheap', False) else queue).append(task)
+
+        for name, deg in in_degree.items():
+            if deg == 0:
+                make_ready(dag.tasks[name])
+                decided.add(name)
+
+        def context_for(*tasks) -> TaskContext:
+            upstream = {p: handles[p] for t in tasks for p in parents[t.name] if p in handles}
+            return TaskContext(wf_id, run_id, global_params, upstream)
+
+        def resolve(name: str, status: TaskStatus):
+            # Terminal without running: skipped, or blocked by a failed upstream
+            outcomes[name] = status
+            if status == TaskStatus.SKIPPED:
+                run.add_result(name, ResultHandle(name))
+                if replayed and name in replayed.skipped:
+                    return  # journaled before a restart
+                if self.journal:
+                    self.journal.task_skipped(wf_id, name)
+                self.notify("task_skipped", {"workflow_id": wf_id, "task": name})
+            else:
+                if replayed and name in replayed.upstream_failed:
+                    return
+                if self.journal:
+                    self.journal.task_upstream_failed(wf_id, name)
+                self.notify("task_upstream_failed", {"workflow_id": wf_id, "task": name})
+
+        def settle(name: str, edge: int):
+            """
+            Applies one parent outcome to a child's counters and evaluates its trigger
+            rule; tasks resolved without running propagate to their own children.
+            """
+            stack = [(name, edge)]
+            while stack:
+                name, edge = stack.pop()
+                if name in decided:
+                    continue
+                in_degree[name] -= 1
+                counts[name][edge] += 1
+                rule = getattr(dag.tasks[name], 'trigger_rule', TriggerRule.ALL_SUCCESS)
+                verdict = triggers.evaluate(rule, *counts[name], in_degree[name])
+                if verdict is None:
+                    continue
+                decided.add(name)
+                if verdict == triggers.RUN:
+                    make_ready(dag.tasks[name])
+                    continue
+                resolve(name, verdict)
+                child_edge = triggers.SKIPPED if verdict == TaskStatus.SKIPPED else triggers.FAILED
+                stack.extend((child, child_edge) for child in dag.dependencies.get(name, ()))
+
+        def encode(task, res, replaying: bool = False) -> Optional[bytes]:
+            # Pickle at most once: the same bytes size the result, and are journaled and cached
+            journaling = self.journal is not None and not replaying
+            if res is not None and (journaling or cache_keys.get(task.name) or store.needs_pickle(res)):
+                return dumps(res)
+            return None
+
+        async def store_result(task, res) -> tuple:
+            """Pickles and wraps a finished task's result; a spill is written to disk off the event loop."""
+            pickled = encode(task, res)
+            if store.spills(res, pickled):
+                return await asyncio.to_thread(store.wrap, wf_id, task.name, res, pickled), pickled
+            return store.wrap(wf_id, task.name, res, pickled), pickled
+
+        def complete(task, res, batch_events: Optional[list] = None, event: str = "task_completed",
+                     replaying: bool = False, stored: Optional[tuple] = None):
+            # Branching Logic (validated before the completion is journaled)
+            children_to_visit, skipped = self._children_to_visit(dag, task, res)
+            key = cache_keys.pop(task.name, None)
+            if stored is None:
+                pickled = encode(task, res, replaying)
+                stored = store.wrap(wf_id, task.name, res, pickled), pickled
+            handle, pickled = stored
+            run.add_result(task.name, handle)
+            if self.memory_budget is not None:
+                self._enforce_memory_budget()
+            if batch_events is not None:
+                # Journaled and notified once per batch by the caller
+                batch_events.append({"task": task.name, "result": res, "pickled": pickled})
+            elif not replaying:
+                if self.journal:
+                    self.journal.task_completed(wf_id, task.name, res, pickled)
+                self.notify(event, {"workflow_id": wf_id, "task": task.name, "result": res})
+            if key:
+                self.cache.put(key, res, pickled)
+
+            # Children a branch did not choose see a skipped parent
+            for child_name in children_to_visit:
+                settle(child_name, triggers.SUCCESS)
+            for s in skipped:
+                settle(s, triggers.SKIPPED)
+
+        def failed(task):
+            outcomes[task.name] = TaskStatus.FAILED
+            for child_name in dag.dependencies.get(task.name, ()):
+                settle(child_name, triggers.FAILED)
+
+        async def fail(task, error: Exception, command: ExecuteTaskCommand):
+            cache_keys.pop(task.name, None)
+            if self.journal:
+                self.journal.task_failed(wf_id, task.name, str(error))
+            self.notify("task_failed", {"workflow_id": wf_id, "task": task.name, "error": str(error)})
+            failed(task)
+            # Undo/Compensate
+            await command.undo()
+
+        resumed = bool(replayed and (replayed.completed or replayed.failed or replayed.skipped
+                                     or replayed.upstream_failed))
+        # Incremental re-run: outputs reused from a previous run are journaled as this
+        # run's own completions, then replayed like a resume
+        reused = {name: res for name, res in dag.reuse.items() if not (replayed and name in replayed.completed)}
+        if reused:
+            if self.journal:
+                self.journal.tasks_completed(wf_id, list(reused.items()))
+            replayed = replayed or JournalState(wf_id)
+            replayed.completed.update(reused)
+            self.notify("workflow_incremental", {"id": wf_id, "reused": sorted(reused)})
+        if resumed or reused:
+            # Apply journaled outcomes without executing anything; what remains is the frontier
+            frontier = deque()
+            while queue or cheap:
+                task = (queue or cheap).popleft()
+                if task.name in replayed.completed:
+                    complete(task, replayed.completed[task.name], replaying=True)
+                elif task.name in replayed.failed:
+                    # Terminal outcomes are never retried on resume
+                    failed(task)
+                else:
+                    frontier.append(task)
+            for task in frontier:
+                make_ready(task)
+            if resumed:
+                self.notify("workflow_resumed", {"id": wf_id, "frontier": [t.name for t in frontier]})
+
+        # Event-driven dispatch: each completion immediately releases its children
+        # instead of waiting for the whole wave, and never blocks the event loop.
+        in_flight: Dict[asyncio.Future, tuple] = {}
+        while queue or cheap or in_flight:
+            # Dispatch ready tasks while the run is not paused, global task slots are
+            # available and the backend accepts work (in-flight tasks finish regardless)
+            while ((queue or cheap) and not run.paused and not (self._task_slots and self._task_slots.locked())
+                   and not self.backend.saturated()):
+                task = queue.popleft() if queue else cheap.popleft()
+                if self.cache and task.params.get('cache', True) is not False:
+                    key = self.cache.key_for(task, {p: handles[p].cache_token() if p in handles else None
+                                                    for p in parents[task.name]}, global_params)
+                    if key:
+                        hit, value = self.cache.get(key)
+                        if hit:
+                            # Cache hit: skip dispatch entirely
+                            try:
+                                complete(task, value, event="task_cached")
+                            except Exception as e:
+                                await fail(task, e, ExecuteTaskCommand(task, context, self.backend))
+                            continue
+                        cache_keys[task.name] = key
+                if self._task_slots:
+                    await self._task_slots.acquire()
+                if getattr(task, 'type_name', '') == "mapped_task":
+                    # Dynamic mapping: expanded lazily over the upstream result
+                    # Only a parent's result; any other task's may or may not have finished yet
+                    upstream = handles.get(task.upstream) if task.upstream in parents[task.name] else None
+                    task_context = context_for(task)
+                    future = asyncio.ensure_future(self._run_mapped(wf_id, task, upstream, task_context, dag))
+                    in_flight[future] = (task, ExecuteTaskCommand(task, task_context, self.backend))
+                    self.notify("task_started", {"workflow_id": wf_id, "task": task.name})
+                elif self.batch_size and getattr(task, 'cheap', False):
+                    # Micro-batching: group ready cheap tasks into one backend submission.
+                    # Every member holds a task slot; members join only while slots are free.
+                    batch = [task]
+                    while cheap and len(batch) < self.batch_size:
+                        if self._task_slots:
+                            if self._task_slots.locked():
+                                break
+                            await self._task_slots.acquire()
+                        batch.append(cheap.popleft())
+                    # One context per batch, carrying the upstream handles of every member
+                    future = asyncio.wrap_future(
+                        self.backend.submit_batch(batch, dag.priority, dag.tenant or wf_id, context_for(*batch))
+                    )
+                    in_flight[future] = (batch, None)
+                    self.active_tasks += len(batch)
+                    self.notify("task_batch_started", {"workflow_id": wf_id, "tasks": [t.name for t in batch]})
+                    continue
+                else:
+                    # Command Pattern
+                    command = ExecuteTaskCommand(task, context_for(task), self.backend, dag.priority, dag.tenant or wf_id)
+                    future = asyncio.wrap_future(await command.execute())
+                    in_flight[future] = (task, command)
+                    self.notify("task_started", {"workflow_id": wf_id, "task": task.name})
+                self.active_tasks += 1
+
+            if not in_flight:
+                # Nothing to wait on: either the queue was drained without dispatching
+                # (e.g. cache hits), or dispatch is blocked by pause/other runs/backpressure
+                waiting = queue or cheap
+                if waiting and run.paused:
+                    await run.wait_until_running()
+                elif waiting and self.backend.saturated():
+                    # Backend queue is over its depth limit; back off before retrying
+                    await asyncio.sleep(self.backpressure_delay)
+                elif waiting and self._task_slots and self._task_slots.locked():
+                    # Slots are held by other runs; wait for one to free up
+                    async with self._task_slots:
+                        pass
                 continue
 
-            current_batch = queue[:]
-            queue = []
-            
-            # Create Commands
-            commands = [
-                ExecuteTaskCommand(task, context, self.backend) 
-                for task in current_batch
-            ]
-            
-            # Execute Batch Concurrently
-            # In a real engine, we would track futures more granularly
-            futures = await asyncio.gather(*[cmd.execute() for cmd in commands])
-            
-            # Process Results (Hybrid: Local backend returns Future, we wait on it)
-            # Since local backend uses ThreadPool, we need to await the future properly or use run_in_executor
-            # For this demo, let's assume backend returns a Future we can result() on (blocking but safe in thread)
-            # To be truly async non-blocking, we'd wrap connection.
-            
-            for i, task in enumerate(current_batch):
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                task, command = in_flight.pop(future)
+                # A batch holds one slot per member
+                for _ in (task if isinstance(task, list) else (task,)):
+                    self.active_tasks -= 1
+                    if self._task_slots:
+                        self._task_slots.release()
+                if isinstance(task, list):
+                    await self._complete_batch(wf_id, task, future, context, dag, complete, fail, store_result)
+                    continue
                 try:
-                    # Sync wait for thread result
-                    res = futures[i].result()
-                    results[task.name] = res
-                    self.notify("task_completed", {"workflow_id": wf_id, "task": task.name, "result": res})
-                    
-                    if task.name in dag.dependencies:
-                        # Branching Logic
-                        children_to_visit = dag.dependencies[task.name]
-                        
-                        # Check if task is a Branching Task
-                        # We discern via type or attribute. Let's use attribute "type_name" from registry
-                        if getattr(task, 'type_name', '') == "branch_python_task":
-                            # Result MUST be a list of task names
-                            if isinstance(res, list):
-                                allowed_next = set(res)
-                                # Filter children
-                                children_to_visit = [c for c in dag.dependencies[task.name] if c in allowed_next]
-                                
-                                # Mark skipped children immediately?
-                                # Optional, but good for clarity.
-                                skipped = [c for c in dag.dependencies[task.name] if c not in allowed_next]
-                                for s in skipped:
-                                    results[s] = None
-                                    self._results[s] = TaskStatus.SKIPPED
-                                    self.notify("task_skipped", {"workflow_id": wf_id, "task": s})
-                            else:
-                                # Fallback or Error? Treat as normal or fail?
-                                # Fail for safety
-                                raise ValueError(f"Branch task {task.name} did not return a list of task names.")
-
-                        for child_name in children_to_visit:
-                            in_degree[child_name] -= 1
-                            if in_degree[child_name] == 0:
-                                queue.append(dag.tasks[child_name])
-                                
+                    res = future.result()
+                    complete(task, res, stored=await store_result(task, res))
                 except Exception as e:
-                    self.notify("task_failed", {"workflow_id": wf_id, "task": task.name, "error": str(e)})
-                    # Undo/Compensate
-                    await commands[i].undo()
+                    await fail(task, e, command)
         
-        self.notify("workflow_completed", {"id": wf_id})
-        return WorkflowResult(wf_id, TaskStatus.COMPLETED, results)
+        # A run with any failed task (or task blocked by one) is reported as FAILED
+        status = TaskStatus.FAILED if any(o != TaskStatus.SKIPPED for o in outcomes.values()) else TaskStatus.COMPLETED
+        if self.journal:
+            self.journal.run_finished(wf_id, succeeded=status == TaskStatus.COMPLETED)
+        summary = run.summarize(status)
+        self.recent_runs.append(summary)
+        self.notify("workflow_completed", {"id": wf_id, "status": status.value, "duration": summary.duration})
+        # Inline results are returned as values; spilled ones stay behind their handle
+        results = {name: h if h.spilled else h.get() for name, h in handles.items()}
+        return WorkflowResult(wf_id, status, results)
 
     def pause(self, workflow_id: str):
-        if workflow_id in self._states:
-            self._states[workflow_id].pause(self)
+        # In-flight tasks finish; no new task is dispatched until resume()
+        run = self._runs.get(workflow_id)
+        if run:
+            run.control.pause(run)
             self.notify("workflow_paused", {"id": workflow_id})
 
     def resume(self, workflow_id: str):
-        if workflow_id in self._states:
-            self._states[workflow_id].resume(self)
+        run = self._runs.get(workflow_id)
+        if run:
+            run.control.resume(run)
             self.notify("workflow_resumed", {"id": workflow_id})
 
-    # State Pattern Transition Helper
-    def transition_to(self, state: WorkflowState):
-        # This implementation simplifies state tracking to "current active context"
-        # In multi-workflow, we'd pass the workflow_id context.
-        pass
+    def metrics(self) -> Dict[str, Any]:
+        runs = list(self._runs.values())
+        return {
+            "live_runs": len(runs),
+            "paused_runs": sum(1 for r in runs if r.paused),
+            "run_state_bytes": sum(r.footprint() for r in runs),
+            "inline_result_bytes": sum(r.result_bytes for r in runs),
+            "memory_budget": self.memory_budget,
+            "spilled_under_pressure_bytes": self.spilled_under_pressure,
+            "recent_runs": len(self.recent_runs),
+        }
@@ -1,5 +1,7 @@
-from typing import Any, Callable, Dict, List
-from app.core.task import BaseTask, TaskContext
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from app.core.task import BaseTask, TaskContext, logger
+from app.core.results import ResultHandle
 
 class BranchPythonTask(BaseTask):
     type_name = "branch_python_task"
@@ -12,7 +14,7 @@ class BranchPythonTask(BaseTask):
         return callable(self.action)
 
     def execute(self, context: TaskContext) -> List[str]:
-        print(f"Evaluating Branch Task: {self.name}")
+        logger.debug("Evaluating Branch Task: %s", self.name)
         # Action must return list of task names to follow
         next_tasks = self.action(context, self.params)
         
@@ -20,3 +22,68 @@ class BranchPythonTask(BaseTask):
              raise ValueError(f"Branch task {self.name} must return a list of task names.")
              
         return next_tasks
+
+
+class MappedTaskInstance(BaseTask):
+    """
+    One expanded instance of a MappedTask, processing a single chunk of items.
+    Created lazily by the engine; not registered as a task type.
+    """
+    def __init__(self, parent: "MappedTask", index: int, chunk: List[Any]):
+        super().__init__(f"{parent.name}[{index}]", parent.params)
+        self.parent = parent
+        self.index = index
+        self.chunk = chunk
+
+    def execute(self, context: TaskContext) -> Any:
+        return self.parent.action(context, self.params, self.chunk)
+
+
+class MappedTask(BaseTask):
+    """
+    Dynamic fan-out over the list returned by an upstream task.
+    params:
+      - upstream: name of the parent task whose result is the list of items
+      - chunk_size: items handled per instance (default 1)
+      - parallelism: max instances in flight at once (default 8)
+    The engine expands instances lazily as slots free up, so a 1M-item fan-out never
+    materializes 1M task objects. Instance results (in item order) go to reduce;
+    without a reduce callable the list of instance results is returned.
+    """
+    type_name = "mapped_task"
+
+    def __init__(self, name: str, action: Callable[[TaskContext, Dict, List], Any], params: Dict[str, Any] = None,
+                 reduce: Optional[Callable[[TaskContext, Dict, List], Any]] = None):
+        super().__init__(name, params)
+        self.action = action
+        self.reduce = reduce
+        self.upstream = self.params.get('upstream')
+        self.chunk_size = int(self.params.get('chunk_size', 1))
+        self.parallelism = int(self.params.get('parallelism', 8))
+
+    def validate(self) -> bool:
+        return callable(self.action) and bool(self.upstream) and self.chunk_size > 0 and self.parallelism > 0
+
+    def expand(self, items: Iterable[Any]) -> Iterator[MappedTaskInstance]:
+        """Lazily yields one instance per chunk of items."""
+        iterator = iter(items)
+        index = 0
+        while True:
+            chunk = list(islice(iterator, self.chunk_size))
+            if not chunk:
+                return
+            yield MappedTaskInstance(self, index, chunk)
+            index += 1
+
+    def reduce_results(self, context: TaskContext, results: List[Any]) -> Any:
+        if self.reduce:
+            return self.reduce(context, self.params, results)
+        return results
+
+    def execute(self, context: TaskContext) -> Any:
+        # Sequential fallback when run outside the engine's expansion
+        upstream = context.task_results.get(self.upstream)
+        items = upstream.get() if isinstance(upstream, ResultHandle) else upstream
+        if not isinstance(items, list):
+            raise TypeError(f"Mapped task {self.name} expects a list from {self.upstream!r}, got {type(items).__name__}")
+        return self.reduce_results(context, [i.execute(context) for i in self.expand(items)])
@@ -0,0 +1,49 @@
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Set
+
+from app.core.dag import SimpleWorkflowDAG
+from app.core.journal import JournalState
+
+
+def task_fingerprints(task_configs: Iterable[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Hashes each task definition (type, params and upstream names) by task name.
+    Dependencies are part of the fingerprint so rewiring a task counts as a change.
+    """
+    fingerprints = {}
+    for config in task_configs:
+        body = {
+            "type": config.get("type"),
+            "params": config.get("params") or {},
+            "dependencies": sorted(config.get("dependencies") or []),
+        }
+        fingerprints[config["name"]] = hashlib.sha256(
+            json.dumps(body, sort_keys=True, default=repr).encode()
+        ).hexdigest()
+    return fingerprints
+
+
+def changed_tasks(old_configs: Iterable[Dict[str, Any]], new_configs: Iterable[Dict[str, Any]]) -> Set[str]:
+    """Tasks of the new definition that are new or whose definition differs."""
+    old = task_fingerprints(old_configs)
+    return {name for name, fp in task_fingerprints(new_configs).items() if old.get(name) != fp}
+
+
+def plan_incremental(dag: SimpleWorkflowDAG, definition: Dict[str, Any], params: Dict[str, Any],
+                     baseline: JournalState) -> Dict[str, Any]:
+    """
+    Make-style planning against a previous successful run: the changed tasks and
+    their downstream closure are dirty; every other task reuses the baseline's
+    journaled output. Returns the reuse map to set as dag.reuse.
+    Changed run parameters may affect any task, so they invalidate the whole run.
+    """
+    previous = baseline.metadata.get("request") or {}
+    if not previous or (baseline.metadata.get("params") or {}) != (params or {}):
+        return {}
+    dirty = dag.downstream_closure(changed_tasks(previous.get("tasks", []), definition.get("tasks", [])))
+    return {
+        name: baseline.completed[name]
+        for name in dag.tasks
+        if name not in dirty and name in baseline.completed
+    }
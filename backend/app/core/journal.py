@@ -0,0 +1,192 @@
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+@dataclass
+class JournalState:
+    """
+    Replayed view of a single run, rebuilt from the journal on restart.
+    """
+    run_id: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    completed: Dict[str, Any] = field(default_factory=dict)
+    failed: Dict[str, str] = field(default_factory=dict)
+    skipped: Set[str] = field(default_factory=set)
+    upstream_failed: Set[str] = field(default_factory=set)
+    started: bool = False
+    finished: bool = False
+
+
+class RunJournal:
+    """
+    Append-only run journal backed by SQLite.
+    Every task completion, failure and branch skip is written as it happens so a
+    restarted engine can replay a run and resume from its unfinished frontier.
+    """
+    RUN_STARTED = "run_started"
+    TASK_COMPLETED = "task_completed"
+    TASK_FAILED = "task_failed"
+    TASK_SKIPPED = "task_skipped"
+    TASK_UPSTREAM_FAILED = "task_upstream_failed"
+    RUN_FINISHED = "run_finished"
+
+    def __init__(self, path: str = "pytaskflow_journal.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # WAL keeps appends cheap and readers unblocked; NORMAL survives process crashes.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS journal ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " run_id TEXT NOT NULL,"
+            " event TEXT NOT NULL,"
+            " task TEXT,"
+            " payload BLOB,"
+            " ts REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_journal_run ON journal (run_id, seq)")
+        # Latest successful run per workflow: the incremental re-run baseline without scanning the journal
+        backfill = not self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'last_success'"
+        ).fetchone()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS last_success ("
+            " workflow_key TEXT PRIMARY KEY,"
+            " run_id TEXT NOT NULL)"
+        )
+        if backfill:
+            self._backfill_last_success()
+
+    @staticmethod
+    def workflow_key(run_id: str) -> str:
+        """Execution ids are '<workflow id>-<suffix>'; ids without a suffix are their own key."""
+        return run_id.rpartition("-")[0] or run_id
+
+    def _backfill_last_success(self):
+        # Journals written before the last_success table existed
+        rows = self._conn.execute(
+            "SELECT run_id FROM journal WHERE event = ? AND run_id NOT IN"
+            " (SELECT run_id FROM journal WHERE event IN (?, ?)) ORDER BY seq",
+            (self.RUN_FINISHED, self.TASK_FAILED, self.TASK_UPSTREAM_FAILED),
+        ).fetchall()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO last_success (workflow_key, run_id) VALUES (?, ?)",
+            [(self.workflow_key(run_id), run_id) for (run_id,) in rows],
+        )
+
+    def _append(self, run_id: str, event: str, task: Optional[str] = None, payload: Optional[bytes] = None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO journal (run_id, event, task, payload, ts) VALUES (?, ?, ?, ?, ?)",
+                (run_id, event, task, payload, time.time()),
+            )
+
+    @staticmethod
+    def _dump_result(result: Any, pickled: Optional[bytes] = None) -> bytes:
+        if pickled is not None:
+            return pickled
+        try:
+            return pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # Unpicklable results are kept as their repr; the task is still never re-run.
+            return pickle.dumps(repr(result))
+
+    def run_started(self, run_id: str, metadata: Optional[Dict[str, Any]] = None):
+        self._append(run_id, self.RUN_STARTED, payload=json.dumps(metadata or {}, default=str).encode())
+
+    def task_completed(self, run_id: str, task_name: str, result: Any, pickled: Optional[bytes] = None):
+        """pickled: the result already pickled by the engine, stored as-is."""
+        self._append(run_id, self.TASK_COMPLETED, task_name, self._dump_result(result, pickled))
+
+    def tasks_completed(self, run_id: str, completions: List[Tuple[str, Any]],
+                        pickled: Optional[List[Optional[bytes]]] = None):
+        """Journals a micro-batch of completions in a single write."""
+        now = time.time()
+        pickled = pickled or [None] * len(completions)
+        rows = [(run_id, self.TASK_COMPLETED, name, self._dump_result(res, data), now)
+                for (name, res), data in zip(completions, pickled)]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT INTO journal (run_id, event, task, payload, ts) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self._conn.execute("COMMIT")
+
+    def task_failed(self, run_id: str, task_name: str, error: str):
+        self._append(run_id, self.TASK_FAILED, task_name, error.encode())
+
+    def task_skipped(self, run_id: str, task_name: str):
+        self._append(run_id, self.TASK_SKIPPED, task_name)
+
+    def task_upstream_failed(self, run_id: str, task_name: str):
+        self._append(run_id, self.TASK_UPSTREAM_FAILED, task_name)
+
+    def run_finished(self, run_id: str, succeeded: bool = False):
+        """succeeded: no task failed, so the run becomes its workflow's incremental baseline."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "INSERT INTO journal (run_id, event, task, payload, ts) VALUES (?, ?, ?, ?, ?)",
+                (run_id, self.RUN_FINISHED, None, None, time.time()),
+            )
+            if succeeded:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO last_success (workflow_key, run_id) VALUES (?, ?)",
+                    (self.workflow_key(run_id), run_id),
+                )
+            self._conn.execute("COMMIT")
+
+    def replay(self, run_id: str) -> JournalState:
+        state = JournalState(run_id)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT event, task, payload FROM journal WHERE run_id = ? ORDER BY seq", (run_id,)
+            ).fetchall()
+        for event, task, payload in rows:
+            if event == self.RUN_STARTED:
+                state.started = True
+                state.metadata = json.loads(payload) if payload else {}
+            elif event == self.TASK_COMPLETED:
+                state.completed[task] = pickle.loads(payload)
+            elif event == self.TASK_FAILED:
+                state.failed[task] = payload.decode() if payload else ""
+            elif event == self.TASK_SKIPPED:
+                state.skipped.add(task)
+            elif event == self.TASK_UPSTREAM_FAILED:
+                state.upstream_failed.add(task)
+            elif event == self.RUN_FINISHED:
+                state.finished = True
+        return state
+
+    def unfinished_runs(self) -> Dict[str, JournalState]:
+        """Runs that were started but never finished, e.g. because the process died."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT run_id FROM journal WHERE event = ? AND run_id NOT IN"
+                " (SELECT run_id FROM journal WHERE event = ?)",
+                (self.RUN_STARTED, self.RUN_FINISHED),
+            ).fetchall()
+        return {run_id: self.replay(run_id) for (run_id,) in rows}
+
+    def last_successful_run(self, workflow_key: str) -> Optional[JournalState]:
+        """
+        Most recently finished run of workflow_key that had no task failures, or
+        None. Used as the baseline for incremental re-runs. Replays one run from
+        disk, so call it off the event loop.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT run_id FROM last_success WHERE workflow_key = ?", (workflow_key,)
+            ).fetchone()
+        return self.replay(row[0]) if row else None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,197 @@
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+TASK_LOGGER = "pytaskflow.tasks"
+
+# (created, level name, message)
+LogEntry = Tuple[float, str, str]
+
+_bound = threading.local()
+
+
+@contextmanager
+def bind_task(workflow_id: str, task_name: str):
+    """
+    Attributes log records emitted by this thread to a task while it executes.
+    Executors wrap task.execute() in it; task code just logs through context.log.
+    """
+    previous = getattr(_bound, "key", None)
+    _bound.key = (workflow_id, task_name)
+    try:
+        yield
+    finally:
+        _bound.key = previous
+
+
+def current_task() -> Optional[Tuple[str, str]]:
+    return getattr(_bound, "key", None)
+
+
+def log_name(task) -> str:
+    # Mapped instances log under their parent task
+    return getattr(task, "parent", task).name
+
+
+class TaskLogBuffer:
+    """
+    Bounded in-memory log capture: one ring buffer of lines_per_task entries per
+    (workflow id, task), at most max_tasks buffers (oldest dropped first).
+    Followers get every new entry through a callback, called on the logging thread.
+    """
+    def __init__(self, lines_per_task: int = 500, max_tasks: int = 10000):
+        self.lines_per_task = lines_per_task
+        self.max_tasks = max_tasks
+        self._buffers: Dict[Tuple[str, str], Deque[LogEntry]] = {}
+        self._followers: Dict[Tuple[str, str], List[Callable[[LogEntry], None]]] = {}
+        self._lock = threading.Lock()
+
+    def append(self, key: Tuple[str, str], entry: LogEntry):
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            with self._lock:
+                buffer = self._buffers.get(key)
+                if buffer is None:
+                    while len(self._buffers) >= self.max_tasks:
+                        del self._buffers[next(iter(self._buffers))]
+                    buffer = self._buffers[key] = deque(maxlen=self.lines_per_task)
+        buffer.append(entry)
+        followers = self._followers.get(key)
+        if followers:
+            for callback in list(followers):
+                callback(entry)
+
+    def tail(self, workflow_id: str, task_name: str, n: Optional[int] = None) -> List[LogEntry]:
+        entries = list(self._buffers.get((workflow_id, task_name), ()))
+        return entries[-n:] if n else entries
+
+    def follow(self, workflow_id: str, task_name: str, callback: Callable[[LogEntry], None],
+               n: Optional[int] = None) -> Tuple[List[LogEntry], Callable[[], None]]:
+        """
+        Subscribes to new entries. Returns (the last n entries, unsubscribe), taken
+        together so no entry is missed or delivered twice.
+        """
+        key = (workflow_id, task_name)
+        with self._lock:
+            snapshot = self.tail(workflow_id, task_name, n)
+            self._followers.setdefault(key, []).append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                followers = self._followers.get(key, [])
+                if callback in followers:
+                    followers.remove(callback)
+                if not followers:
+                    self._followers.pop(key, None)
+        return snapshot, unsubscribe
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "task_buffers": len(self._buffers),
+            "lines_per_task": self.lines_per_task,
+            "max_tasks": self.max_tasks,
+            "followers": sum(len(f) for f in self._followers.values()),
+        }
+
+
+class RingBufferHandler(logging.Handler):
+    """Appends task-bound records to a TaskLogBuffer; records outside a task are ignored."""
+    def __init__(self, buffer: TaskLogBuffer):
+        super().__init__()
+        self.buffer = buffer
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # No handler lock: deque appends are atomic, so worker threads never wait on each other
+        self.emit(record)
+        return True
+
+    def emit(self, record: logging.LogRecord):
+        key = current_task()
+        if key is not None:
+            self.buffer.append(key, (record.created, record.levelname, record.getMessage()))
+
+
+class _TaskFilter(logging.Filter):
+    # Stamps the bound task on the record for the file formatter (runs on the caller's thread)
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.workflow_id, record.task = current_task() or ("-", "-")
+        return True
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the sink falls behind."""
+    def __init__(self, q: queue.Queue):
+        super().__init__(q)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class TaskLogging:
+    """
+    Task log capture for the pytaskflow.tasks logger:
+    - every task-bound record goes to a bounded ring buffer (tail/follow API)
+    - with log_dir, records are also queued to a background QueueListener that
+      writes them to a size-rotated file, so worker threads never touch the disk
+    """
+    FORMAT = "%(asctime)s %(levelname)s [%(workflow_id)s/%(task)s] %(message)s"
+
+    def __init__(self, lines_per_task: int = 500, max_tasks: int = 10000, log_dir: Optional[str] = None,
+                 max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5, level: int = logging.INFO,
+                 queue_size: int = 10000):
+        self.buffer = TaskLogBuffer(lines_per_task, max_tasks)
+        self.log_dir = log_dir
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.level = level
+        self.queue_size = queue_size
+        self.logger = logging.getLogger(TASK_LOGGER)
+        self._handlers: List[logging.Handler] = []
+        self._filter = _TaskFilter()
+        self._queue_handler: Optional[_DroppingQueueHandler] = None
+        self._listener: Optional[QueueListener] = None
+
+    def start(self):
+        if self._handlers:
+            return
+        self.logger.setLevel(self.level)
+        self.logger.propagate = False
+        self.logger.addFilter(self._filter)
+        self._handlers.append(RingBufferHandler(self.buffer))
+        if self.log_dir:
+            os.makedirs(self.log_dir, exist_ok=True)
+            sink = RotatingFileHandler(os.path.join(self.log_dir, "tasks.log"),
+                                       maxBytes=self.max_bytes, backupCount=self.backup_count)
+            sink.setFormatter(logging.Formatter(self.FORMAT))
+            self._queue_handler = _DroppingQueueHandler(queue.Queue(self.queue_size))
+            self._handlers.append(self._queue_handler)
+            self._listener = QueueListener(self._queue_handler.queue, sink)
+            self._listener.start()
+        for handler in self._handlers:
+            self.logger.addHandler(handler)
+
+    def stop(self):
+        for handler in self._handlers:
+            self.logger.removeHandler(handler)
+        self._handlers = []
+        self.logger.removeFilter(self._filter)
+        if self._listener:
+            # Flushes whatever is still queued
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+
+    def metrics(self) -> Dict[str, int]:
+        metrics = self.buffer.metrics()
+        metrics["dropped"] = self._queue_handler.dropped if self._queue_handler else 0
+        return metrics
@@ -1,8 +1,11 @@
+import logging
 import weakref
 from abc import ABC, abstractmethod
 from typing import List, Protocol
 from app.interfaces import Task
 
+logger = logging.getLogger(__name__)
+
 # --- Observer Pattern ---
 class Observer(Protocol):
     def update(self, event: str, data: any):
@@ -39,21 +42,23 @@ class Command(ABC):
         pass
 
 class ExecuteTaskCommand(Command):
-    def __init__(self, task: Task, context: dict, backend):
+    def __init__(self, task: Task, context: dict, backend, priority: int = 0, tenant: str = None):
         self.task = task
         self.context = context
         self.backend = backend
+        self.priority = priority
+        self.tenant = tenant
         self.result = None
 
     async def execute(self):
         # Delegate to backend strategy
-        future = self.backend.submit_task(self.task)
+        future = self.backend.submit_task(self.task, priority=self.priority, tenant=self.tenant, context=self.context)
         # Note: In real command pattern, we might want to wait here or handle async properly.
         # For this design, we assume execute initiates the action.
         return future
 
     async def undo(self):
-        print(f"Undoing task {self.task.name} (Simulated rollback)")
+        logger.info("Undoing task %s (Simulated rollback)", self.task.name)
         # Logic to compensate or rollback side effects
 
 # --- State Pattern ---
@@ -72,36 +77,36 @@ class WorkflowState(ABC):
 
 class RunningState(WorkflowState):
     def run(self, context) -> bool:
-        print("Workflow is already running")
+        logger.info("Workflow is already running")
         return False
 
     def pause(self, context):
-        print("Pausing workflow...")
+        logger.info("Pausing workflow...")
         context.transition_to(PausedState())
 
     def resume(self, context):
-        print("Workflow is running, cannot resume")
+        logger.info("Workflow is running, cannot resume")
 
 class PausedState(WorkflowState):
     def run(self, context) -> bool:
-        print("Workflow is paused. Use resume().")
+        logger.info("Workflow is paused. Use resume().")
         return False
 
     def pause(self, context):
-        print("Already paused")
+        logger.info("Already paused")
 
     def resume(self, context):
-        print("Resuming workflow...")
+        logger.info("Resuming workflow...")
         context.transition_to(RunningState())
         # Ideally trigger engine resume logic here
 
 class CompletedState(WorkflowState):
     def run(self, context) -> bool:
-        print("Workflow completed. Cannot run again.")
+        logger.info("Workflow completed. Cannot run again.")
         return False
 
     def pause(self, context):
-        print("Workflow finished.")
+        logger.info("Workflow finished.")
 
     def resume(self, context):
-        print("Workflow finished.")
+        logger.info("Workflow finished.")
@@ -0,0 +1,234 @@
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.interfaces import ExecutionBackend, Task
+
+
+class TaskExecutionError(Exception):
+    """
+    Raised on the engine side for a task that failed in a worker process.
+    """
+
+
+class DurableTaskQueue:
+    """
+    Durable local task queue on SQLite, shared by the engine and worker processes.
+    Workers lease tasks in batches; a lease that is not completed before its
+    visibility timeout expires puts the task back in the queue (at-least-once).
+    """
+    QUEUED = "queued"
+    LEASED = "leased"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, path: str = "pytaskflow_queue.db", max_attempts: int = 3):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " id TEXT PRIMARY KEY,"
+            " payload BLOB NOT NULL,"
+            " priority INTEGER NOT NULL DEFAULT 0,"
+            " tenant TEXT,"
+            " status TEXT NOT NULL,"
+            " lease_owner TEXT,"
+            " lease_expires REAL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " enqueued_at REAL NOT NULL,"
+            " finished_at REAL,"
+            " result BLOB,"
+            " error TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_ready ON tasks (status, priority, enqueued_at)")
+
+    def _transaction(self, fn):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                out = fn(self._conn)
+                self._conn.execute("COMMIT")
+                return out
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def enqueue(self, task_id: str, payload: bytes, priority: int = 0, tenant: Optional[str] = None) -> bool:
+        """Returns False if a task with this id is already queued or finished (idempotent re-dispatch)."""
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO tasks (id, payload, priority, tenant, status, enqueued_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (task_id, payload, priority, tenant, self.QUEUED, time.time()),
+            )
+            return cur.rowcount == 1
+
+    def lease(self, worker_id: str, batch_size: int = 10, visibility_timeout: float = 60.0) -> List[Tuple[str, bytes]]:
+        def _lease(conn):
+            now = time.time()
+            self._expire_leases(conn, now)
+            rows = conn.execute(
+                "SELECT id, payload FROM tasks WHERE status = ? ORDER BY priority DESC, enqueued_at LIMIT ?",
+                (self.QUEUED, batch_size),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE tasks SET status = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1 WHERE id = ?",
+                [(self.LEASED, worker_id, now + visibility_timeout, task_id) for task_id, _ in rows],
+            )
+            return rows
+        return self._transaction(_lease)
+
+    def _expire_leases(self, conn, now: float):
+        # Dead-letter tasks whose leases keep expiring, requeue the rest
+        conn.execute(
+            "UPDATE tasks SET status = ?, error = 'Lease expired too many times', finished_at = ?"
+            " WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+            (self.FAILED, now, self.LEASED, now, self.max_attempts),
+        )
+        conn.execute(
+            "UPDATE tasks SET status = ?, lease_owner = NULL, lease_expires = NULL WHERE status = ? AND lease_expires < ?",
+            (self.QUEUED, self.LEASED, now),
+        )
+
+    def heartbeat(self, worker_id: str, task_ids: Iterable[str], visibility_timeout: float = 60.0):
+        """Extends the leases of long-running tasks."""
+        expires = time.time() + visibility_timeout
+        self._transaction(lambda conn: conn.executemany(
+            "UPDATE tasks SET lease_expires = ? WHERE id = ? AND lease_owner = ? AND status = ?",
+            [(expires, task_id, worker_id, self.LEASED) for task_id in task_ids],
+        ))
+
+    def complete(self, worker_id: str, outcomes: List[Tuple[str, bool, Any]]):
+        """Reports a batch of (task_id, ok, result_or_error) in one transaction."""
+        now = time.time()
+        rows = []
+        for task_id, ok, value in outcomes:
+            if ok:
+                rows.append((self.DONE, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), None, now, task_id, worker_id))
+            else:
+                rows.append((self.FAILED, None, str(value), now, task_id, worker_id))
+        # Only the current lease holder may report; a late worker whose lease expired is ignored
+        self._transaction(lambda conn: conn.executemany(
+            "UPDATE tasks SET status = ?, result = ?, error = ?, finished_at = ?, lease_owner = NULL"
+            " WHERE id = ? AND lease_owner = ?",
+            rows,
+        ))
+
+    def fetch_finished(self, task_ids: List[str]) -> List[Tuple[str, str, Optional[bytes], Optional[str]]]:
+        out = []
+        with self._lock:
+            for i in range(0, len(task_ids), 500):
+                chunk = task_ids[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                out.extend(self._conn.execute(
+                    f"SELECT id, status, result, error FROM tasks WHERE status IN (?, ?) AND id IN ({marks})",
+                    (self.DONE, self.FAILED, *chunk),
+                ).fetchall())
+        return out
+
+    def ack(self, task_ids: List[str]):
+        """Deletes finished tasks once their results were delivered to the engine."""
+        self._transaction(lambda conn: conn.executemany("DELETE FROM tasks WHERE id = ?", [(t,) for t in task_ids]))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+            oldest = self._conn.execute(
+                "SELECT MIN(enqueued_at) FROM tasks WHERE status = ?", (self.QUEUED,)
+            ).fetchone()[0]
+        return {
+            "depth": counts.get(self.QUEUED, 0),
+            "leased": counts.get(self.LEASED, 0),
+            "finished_unacked": counts.get(self.DONE, 0) + counts.get(self.FAILED, 0),
+            # Queue lag: age of the oldest task nobody has picked up yet
+            "lag_seconds": (time.time() - oldest) if oldest else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class DurableQueueBackend(ExecutionBackend):
+    """
+    Concrete Strategy that dispatches tasks into a DurableTaskQueue instead of
+    executing them in-process. Worker processes (python -m app.worker) execute
+    them; a poller thread resolves the engine's futures from reported results.
+
+    Task ids are derived from (workflow_id, task name), so a task re-dispatched by a
+    restarted engine attaches to the queued or finished row instead of running twice.
+    Tasks and their actions must be picklable (module-level functions).
+    """
+    def __init__(self, queue: DurableTaskQueue, max_depth: int = 10000, poll_interval: float = 0.05):
+        self.queue = queue
+        self.max_depth = max_depth
+        self.poll_interval = poll_interval
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._depth = 0
+        self._poller = threading.Thread(target=self._poll_loop, name="queue-backend-poller", daemon=True)
+        self._poller.start()
+
+    def submit_task(self, task: Task, priority: int = 0, tenant: Optional[str] = None, context: Any = None) -> Future:
+        if context is not None:
+            task_id = f"{context.workflow_id}:{task.name}"
+        else:
+            task_id = f"adhoc:{task.name}:{uuid.uuid4().hex}"
+        future = Future()
+        future.set_running_or_notify_cancel()
+        with self._lock:
+            self._futures[task_id] = future
+        self.queue.enqueue(task_id, pickle.dumps((task, context), protocol=pickle.HIGHEST_PROTOCOL), priority, tenant)
+        self._wakeup.set()
+        return future
+
+    def _poll_loop(self):
+        while True:
+            self._wakeup.wait(self.poll_interval * 20)
+            try:
+                # Refreshed on every tick, even with nothing in flight: other producers
+                # share the queue, and saturated() must see it drain
+                self._depth = self.queue.stats()["depth"]
+            except sqlite3.Error:
+                pass
+            with self._lock:
+                pending = list(self._futures)
+            if not pending:
+                self._wakeup.clear()
+                continue
+            try:
+                finished = self.queue.fetch_finished(pending)
+            except sqlite3.Error:
+                time.sleep(self.poll_interval)
+                continue
+            for task_id, status, result, error in finished:
+                with self._lock:
+                    future = self._futures.pop(task_id, None)
+                if future is None:
+                    continue
+                if status == DurableTaskQueue.DONE:
+                    future.set_result(pickle.loads(result))
+                else:
+                    future.set_exception(TaskExecutionError(error))
+            if finished:
+                self.queue.ack([row[0] for row in finished])
+            else:
+                time.sleep(self.poll_interval)
+
+    def saturated(self) -> bool:
+        # Backpressure signal: the engine holds back dispatches while the queue is this deep
+        return self._depth >= self.max_depth
+
+    def metrics(self) -> Dict[str, Any]:
+        stats = self.queue.stats()
+        stats["max_depth"] = self.max_depth
+        stats["awaiting_results"] = len(self._futures)
+        return stats
@@ -0,0 +1,225 @@
+import hashlib
+import pickle
+import reprlib
+import sys
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+from app.core.cache import BlobStore
+
+_RAW = b"R"     # bytes-like payload stored as-is, read back zero-copy
+_PICKLE = b"P"  # anything else, pickled
+
+
+def dumps(value: Any) -> Optional[bytes]:
+    """Pickles a result once for every consumer (size check, spill, journal, cache); None if unpicklable."""
+    try:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return None
+
+
+_preview_repr = reprlib.Repr()
+_preview_repr.maxlevel = 3
+_preview_repr.maxlist = _preview_repr.maxtuple = _preview_repr.maxset = _preview_repr.maxdict = 32
+_preview_repr.maxstring = _preview_repr.maxlong = _preview_repr.maxother = 256
+
+
+def preview_text(value: Any, limit: int = 256) -> str:
+    """Truncated text for a result; containers and long strings are never stringified whole."""
+    text = value[:limit + 1] if isinstance(value, str) else _preview_repr.repr(value)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def _approx_size(value: Any) -> int:
+    # Without pickling: exact for strings and bytes, shallow for other objects
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if isinstance(value, memoryview):
+        return value.nbytes
+    return sys.getsizeof(value)
+
+
+class ResultHandle:
+    """
+    Lazy handle to a task's output, passed to downstream tasks through
+    TaskContext.task_results. Small results are held inline; large ones live in a
+    ResultStore and are only read (through mmap) when get() is called.
+    """
+    __slots__ = ("task_name", "_value", "_store", "key", "size")
+
+    def __init__(self, task_name: str, value: Any = None, store: "ResultStore" = None,
+                 key: Optional[str] = None, size: int = 0):
+        self.task_name = task_name
+        self._value = value
+        self._store = store
+        self.key = key
+        self.size = size
+
+    @property
+    def spilled(self) -> bool:
+        return self.key is not None
+
+    def get(self) -> Any:
+        """
+        Returns the result. Spilled bytes-like results come back as a read-only
+        memoryview over the mapped file (no copy); other spilled results are unpickled.
+        """
+        if self.key is None:
+            return self._value
+        return self._store.load(self.key)
+
+    def cache_token(self) -> Any:
+        # Content hash for spilled results, so cache keys never force a load
+        return ("spilled", self.key) if self.key is not None else self._value
+
+    def preview(self, limit: int = 256) -> Optional[str]:
+        if self.key is not None:
+            return f"<{self.size} bytes spilled to disk>"
+        if self._value is None:
+            return None
+        return preview_text(self._value, limit)
+
+    def __getstate__(self):
+        # A spilled handle crosses process boundaries (queue workers) as a reference:
+        # the store holds a lock and is not picklable, so only its blob directory is sent
+        root = self._store.blobs.root if self.key is not None else None
+        return (self.task_name, self._value, self.key, root, self.size)
+
+    def __setstate__(self, state):
+        self.task_name, self._value, self.key, root, self.size = state
+        self._store = ResultStore.attach(root) if root is not None else None
+
+    def __repr__(self):
+        return f"ResultHandle({self.task_name!r}, spilled={self.spilled}, size={self.size})"
+
+
+class ResultStore:
+    """
+    Spill store for large task results.
+    Results above spill_threshold bytes are written once to a content-addressed
+    BlobStore and referenced by handle; the engine keeps only the handle in memory.
+    spill_threshold=None disables spilling (every handle holds its value inline).
+    """
+    _attached: Dict[str, "ResultStore"] = {}
+    _attached_lock = threading.Lock()
+
+    def __init__(self, root: Optional[str] = None, spill_threshold: Optional[int] = 1024 * 1024):
+        self.spill_threshold = spill_threshold
+        self._root = root
+        self._blobs: Optional[BlobStore] = None
+        self._lock = threading.Lock()
+        # Spilled keys per run and reference counts (identical payloads share a blob)
+        self._by_run: Dict[str, set] = {}
+        self._refs: Dict[str, int] = {}
+        self.spilled_bytes = 0
+
+    @classmethod
+    def attach(cls, root: str) -> "ResultStore":
+        """Read access to a spill directory written by another store (one instance per root)."""
+        with cls._attached_lock:
+            store = cls._attached.get(root)
+            if store is None:
+                store = cls._attached[root] = cls(root=root, spill_threshold=None)
+            return store
+
+    @property
+    def blobs(self) -> BlobStore:
+        if self._blobs is None:
+            self._blobs = BlobStore(self._root or tempfile.mkdtemp(prefix="pytaskflow-results-"))
+        return self._blobs
+
+    def needs_pickle(self, value: Any) -> bool:
+        """True if wrap() must pickle value to measure it (callers can pass the bytes in)."""
+        return (self.spill_threshold is not None and value is not None
+                and not isinstance(value, (bytes, bytearray, memoryview))
+                and not (isinstance(value, str) and len(value) <= self.spill_threshold // 4))
+
+    def spills(self, value: Any, pickled: Optional[bytes] = None) -> bool:
+        """True if wrap(value, pickled) will write value to disk, so callers can run it off the event loop."""
+        if self.spill_threshold is None or value is None:
+            return False
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return _approx_size(value) > self.spill_threshold
+        return pickled is not None and len(pickled) > self.spill_threshold
+
+    def wrap(self, run_id: str, task_name: str, value: Any, pickled: Optional[bytes] = None) -> ResultHandle:
+        """pickled: the value already pickled by the caller, reused instead of pickling again."""
+        if value is None:
+            return ResultHandle(task_name, value)
+        if self.spill_threshold is None:
+            # Never spilled, but the size still counts against the run's memory budget
+            return ResultHandle(task_name, value, size=_approx_size(value))
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            kind, data = _RAW, bytes(value)
+        elif isinstance(value, str) and len(value) <= self.spill_threshold // 4:
+            # Cheap early-out: cannot exceed the threshold even at 4 bytes/char
+            return ResultHandle(task_name, value, size=len(value))
+        else:
+            kind, data = _PICKLE, pickled if pickled is not None else dumps(value)
+            if data is None:
+                return ResultHandle(task_name, value)
+        if len(data) <= self.spill_threshold:
+            return ResultHandle(task_name, value, size=len(data))
+        return self._spill(run_id, task_name, kind, data)
+
+    def force_spill(self, run_id: str, handle: ResultHandle) -> ResultHandle:
+        """Spills an inline handle regardless of size (used under memory pressure)."""
+        if handle.spilled or handle.get() is None:
+            return handle
+        value = handle.get()
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return self._spill(run_id, handle.task_name, _RAW, bytes(value))
+        try:
+            return self._spill(run_id, handle.task_name, _PICKLE, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return handle
+
+    def _spill(self, run_id: str, task_name: str, kind: bytes, data: bytes) -> ResultHandle:
+        key = hashlib.sha256(kind + data).hexdigest()
+        with self._lock:
+            first = key not in self._refs
+            run_keys = self._by_run.setdefault(run_id, set())
+            if key not in run_keys:
+                run_keys.add(key)
+                self._refs[key] = self._refs.get(key, 0) + 1
+        if first:
+            # Engine completions call this from a worker thread (see spills())
+            self.blobs.put(key, data, kind)
+            with self._lock:
+                self.spilled_bytes += len(data)
+        return ResultHandle(task_name, store=self, key=key, size=len(data))
+
+    def load(self, key: str) -> Any:
+        blob = self.blobs.open(key)
+        if blob is None:
+            raise KeyError(f"Spilled result {key} is no longer available")
+        if blob[:1] == _RAW:
+            # The memoryview keeps the mapping alive; no copy of the payload is made
+            return memoryview(blob)[1:]
+        with blob:
+            with memoryview(blob) as view, view[1:] as payload:
+                return pickle.loads(payload)
+
+    def release_run(self, run_id: str):
+        """Drops a finished run's spilled results once nothing else references them."""
+        with self._lock:
+            keys = self._by_run.pop(run_id, set())
+            dead = []
+            for key in keys:
+                self._refs[key] -= 1
+                if not self._refs[key]:
+                    del self._refs[key]
+                    dead.append(key)
+        for key in dead:
+            self.blobs.delete(key)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "spill_threshold": self.spill_threshold,
+                "spilled_blobs": len(self._refs),
+                "spilled_bytes_total": self.spilled_bytes,
+                "runs_with_spills": len(self._by_run),
+            }
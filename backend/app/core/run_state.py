@@ -0,0 +1,120 @@
+import asyncio
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Set
+
+from app.core.patterns import WorkflowState, RunningState, PausedState
+from app.core.results import ResultHandle, ResultStore
+from app.interfaces import TaskStatus
+
+
+@dataclass
+class RunSummary:
+    """
+    What is kept of a run once it finishes: its outcome, timings and task counts.
+    """
+    workflow_id: str
+    status: TaskStatus
+    started_at: float
+    finished_at: float
+    task_counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return self.finished_at - self.started_at
+
+
+class RunState:
+    """
+    All mutable engine state for one active run: scheduling counters, the ready
+    queue, result handles and control state. Also the context object of the State
+    pattern (RunningState/PausedState call transition_to on it).
+    The engine registers it while the run is active and drops it on completion,
+    keeping only a RunSummary.
+    """
+    def __init__(self, workflow_id: str, run_id: str, task_names):
+        self.workflow_id = workflow_id
+        self.run_id = run_id
+        self.control: WorkflowState = RunningState()
+        self._running = asyncio.Event()
+        self._running.set()
+
+        self.in_degree: Dict[str, int] = {name: 0 for name in task_names}
+        self.parents: Dict[str, List[str]] = {name: [] for name in task_names}
+        # Succeeded / failed / skipped parent counts, indexed by triggers.SUCCESS etc.
+        self.counts: Dict[str, List[int]] = {name: [0, 0, 0] for name in task_names}
+        # Tasks already queued to run or resolved without running
+        self.decided: Set[str] = set()
+        # Tasks that did not succeed: FAILED, UPSTREAM_FAILED or SKIPPED
+        self.outcomes: Dict[str, TaskStatus] = {}
+        self.ready: Deque = deque()
+        # Ready cheap tasks, kept apart while the engine micro-batches so a batch forms in O(batch)
+        self.ready_cheap: Deque = deque()
+        self.handles: Dict[str, ResultHandle] = {}
+        self.cache_keys: Dict[str, str] = {}
+        # Bytes of results held inline (as measured by the ResultStore)
+        self.result_bytes = 0
+
+        self.started_at = time.time()
+        self.updated_at = self.started_at
+        self.finished_at: Optional[float] = None
+
+    # --- State pattern context ---
+    def transition_to(self, state: WorkflowState):
+        self.control = state
+        if isinstance(state, PausedState):
+            self._running.clear()
+        else:
+            self._running.set()
+
+    @property
+    def paused(self) -> bool:
+        return isinstance(self.control, PausedState)
+
+    async def wait_until_running(self):
+        await self._running.wait()
+
+    # --- Results ---
+    def add_result(self, name: str, handle: ResultHandle):
+        old = self.handles.get(name)
+        if old is not None and not old.spilled:
+            self.result_bytes -= old.size
+        self.handles[name] = handle
+        if not handle.spilled:
+            self.result_bytes += handle.size
+        self.updated_at = time.time()
+
+    def spill(self, store: ResultStore, target_bytes: int) -> int:
+        """Spills inline results, largest first, until at most target_bytes remain inline."""
+        freed = 0
+        inline = sorted((h for h in self.handles.values() if not h.spilled and h.size),
+                        key=lambda h: h.size, reverse=True)
+        for handle in inline:
+            if self.result_bytes <= target_bytes:
+                break
+            spilled = store.force_spill(self.workflow_id, handle)
+            if spilled is not handle:
+                self.add_result(handle.task_name, spilled)
+                freed += handle.size
+        return freed
+
+    def footprint(self) -> int:
+        """Approximate bytes held by this run: bookkeeping containers plus inline results."""
+        containers = (self.in_degree, self.parents, self.counts, self.decided, self.outcomes,
+                      self.ready, self.ready_cheap, self.handles, self.cache_keys)
+        size = sum(sys.getsizeof(c) for c in containers)
+        size += sum(sys.getsizeof(p) for p in self.parents.values())
+        size += len(self.counts) * sys.getsizeof([0, 0, 0])
+        return size + self.result_bytes
+
+    def summarize(self, status: TaskStatus) -> RunSummary:
+        self.finished_at = time.time()
+        task_counts: Dict[str, int] = {}
+        for outcome in self.outcomes.values():
+            task_counts[outcome.value] = task_counts.get(outcome.value, 0) + 1
+        succeeded = sum(1 for name in self.handles if name not in self.outcomes)
+        if succeeded:
+            task_counts[TaskStatus.COMPLETED.value] = succeeded
+        return RunSummary(self.workflow_id, status, self.started_at, self.finished_at, task_counts)
@@ -0,0 +1,82 @@
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+
+class _Band:
+    def __init__(self):
+        self.queues: Dict[str, Deque[tuple]] = {}
+        self.active: Deque[str] = deque()
+        self.deficit: Dict[str, float] = {}
+        self.size = 0
+
+
+class FairShareQueue:
+    """
+    Dispatch queue with strict priority bands and Deficit Round Robin across tenants.
+    Higher priority bands are always drained first; inside a band each tenant gets a
+    share proportional to its weight, so one tenant's 5,000-task backfill cannot delay
+    another tenant's short run queued behind it.
+    Not thread-safe: callers hold their own lock.
+    """
+    def __init__(self, weights: Optional[Dict[str, float]] = None, quantum: float = 1.0):
+        # A tenant that never gains deficit would make pop() spin forever
+        bad = {tenant: w for tenant, w in (weights or {}).items() if not w > 0}
+        if bad or not quantum > 0:
+            raise ValueError(f"Tenant weights and quantum must be positive, got weights {bad} and quantum {quantum}")
+        self.weights = weights or {}
+        self.quantum = quantum
+        self._bands: Dict[int, _Band] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, item: Any, priority: int = 0, tenant: str = "default", cost: float = 1.0):
+        band = self._bands.get(priority)
+        if band is None:
+            band = self._bands[priority] = _Band()
+        queue = band.queues.get(tenant)
+        if queue is None:
+            queue = band.queues[tenant] = deque()
+            band.active.append(tenant)
+            band.deficit[tenant] = 0.0
+        queue.append((item, cost))
+        band.size += 1
+        self._size += 1
+
+    def pop(self) -> Any:
+        """Returns the next item to dispatch, or None when empty."""
+        if not self._size:
+            return None
+        priority = max(p for p, band in self._bands.items() if band.size)
+        band = self._bands[priority]
+        while True:
+            tenant = band.active[0]
+            queue = band.queues[tenant]
+            item, cost = queue[0]
+            if band.deficit[tenant] >= cost:
+                band.deficit[tenant] -= cost
+                queue.popleft()
+                if not queue:
+                    # Idle tenants lose their leftover deficit (standard DRR)
+                    band.active.popleft()
+                    del band.queues[tenant]
+                    del band.deficit[tenant]
+                band.size -= 1
+                self._size -= 1
+                if not band.size:
+                    del self._bands[priority]
+                return item
+            band.active.rotate(-1)
+            nxt = band.active[0]
+            band.deficit[nxt] += self.quantum * self.weights.get(nxt, 1.0)
+
+    def depth_by_priority(self) -> Dict[int, int]:
+        return {p: band.size for p, band in sorted(self._bands.items(), reverse=True)}
+
+    def depth_by_tenant(self) -> Dict[str, int]:
+        depths: Dict[str, int] = {}
+        for band in self._bands.values():
+            for tenant, queue in band.queues.items():
+                depths[tenant] = depths.get(tenant, 0) + len(queue)
+        return depths
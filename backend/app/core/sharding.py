@@ -0,0 +1,204 @@
+import bisect
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    Consistent-hash ring with virtual nodes.
+    Removing a node only moves the keys it owned, onto its ring successors.
+    """
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 64):
+        self.vnodes = vnodes
+        self._points: List[int] = []
+        self._owners: Dict[int, str] = {}
+        self.nodes = set()
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: str):
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        for i in range(self.vnodes):
+            point = _hash(f"{node}#{i}")
+            self._owners[point] = node
+            bisect.insort(self._points, point)
+
+    def remove(self, node: str):
+        if node not in self.nodes:
+            return
+        self.nodes.discard(node)
+        for i in range(self.vnodes):
+            point = _hash(f"{node}#{i}")
+            del self._owners[point]
+            self._points.pop(bisect.bisect_left(self._points, point))
+
+    def owner(self, key: str) -> Optional[str]:
+        if not self._points:
+            return None
+        idx = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[self._points[idx]]
+
+
+class ShardCoordinator:
+    """
+    Orchestrator sharding over a shared SQLite store (local stand-in for Redis).
+    Each engine process holds a membership lease it renews by heartbeat; the live
+    members form a HashRing over a fixed set of shards, and every execution id
+    hashes to one shard. Submissions go to a shared inbox and are claimed only by
+    the ring owner of their shard; claims query just this node's shards through the
+    (shard, status) index. When a member's lease expires its claimed, unfinished
+    executions move to the new shard owners, which resume them from the shared run
+    journal. Finished executions are deleted, so the inbox only holds live work.
+    """
+    PENDING = "pending"
+    CLAIMED = "claimed"
+
+    def __init__(self, path: str = "pytaskflow_shards.db", node_id: Optional[str] = None,
+                 lease_ttl: float = 30.0, vnodes: int = 64, shards: int = 256):
+        self.path = path
+        self.node_id = node_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_ttl = lease_ttl
+        self.shards = shards
+        self.ring = HashRing(vnodes=vnodes)
+        self.owned_shards: List[int] = []
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS members (node_id TEXT PRIMARY KEY, lease_expires REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS inbox ("
+            " execution_id TEXT PRIMARY KEY,"
+            " payload TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " owner TEXT,"
+            " submitted_at REAL NOT NULL,"
+            " claimed_at REAL,"
+            " shard INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(inbox)")}
+        if "shard" not in columns:
+            # Inbox written before shards existed: add the column and place live rows
+            self._conn.execute("ALTER TABLE inbox ADD COLUMN shard INTEGER NOT NULL DEFAULT 0")
+            rows = self._conn.execute("SELECT execution_id FROM inbox").fetchall()
+            self._conn.executemany("UPDATE inbox SET shard = ? WHERE execution_id = ?",
+                                   [(self.shard_of(e), e) for e, in rows])
+        self._conn.execute("DELETE FROM inbox WHERE status NOT IN (?, ?)", (self.PENDING, self.CLAIMED))
+        self._conn.execute("DROP INDEX IF EXISTS idx_inbox_status")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_inbox_shard_status ON inbox (shard, status, submitted_at)")
+
+    def heartbeat(self) -> List[str]:
+        """Renews this node's lease and rebuilds the ring from live members."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO members (node_id, lease_expires) VALUES (?, ?)"
+                " ON CONFLICT(node_id) DO UPDATE SET lease_expires = excluded.lease_expires",
+                (self.node_id, now + self.lease_ttl),
+            )
+            live = [row[0] for row in self._conn.execute(
+                "SELECT node_id FROM members WHERE lease_expires > ?", (now,)
+            )]
+        for node in self.ring.nodes - set(live):
+            self.ring.remove(node)
+        for node in live:
+            self.ring.add(node)
+        self.owned_shards = [s for s in range(self.shards) if self.ring.owner(f"shard-{s}") == self.node_id]
+        return live
+
+    def shard_of(self, execution_id: str) -> int:
+        return _hash(execution_id) % self.shards
+
+    def owner_of(self, execution_id: str) -> Optional[str]:
+        return self.ring.owner(f"shard-{self.shard_of(execution_id)}")
+
+    def route(self, execution_id: str, payload: Dict[str, Any]):
+        """Places a submission in the shared inbox; its shard owner picks it up."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO inbox (execution_id, payload, status, submitted_at, shard) VALUES (?, ?, ?, ?, ?)",
+                (execution_id, json.dumps(payload, default=str), self.PENDING, time.time(), self.shard_of(execution_id)),
+            )
+
+    def claim(self, limit: int = 100) -> List[Tuple[str, Dict[str, Any], bool]]:
+        """
+        Claims pending submissions owned by this node, plus unfinished ones whose
+        claimant lost its lease. Returns (execution_id, payload, taken_over).
+        """
+        now = time.time()
+        claimed = []
+        shards = self.owned_shards
+        if not shards:
+            return claimed
+        shard_list = ",".join("?" * len(shards))
+        with self._lock:
+            live = sorted(self.ring.nodes)
+            # Pending work first, then runs whose claimant is gone; both only in this node's shards
+            rows = self._conn.execute(
+                f"SELECT execution_id, payload, status, owner FROM inbox"
+                f" WHERE shard IN ({shard_list}) AND status = ? ORDER BY submitted_at LIMIT ?",
+                (*shards, self.PENDING, limit),
+            ).fetchall()
+            rows += self._conn.execute(
+                f"SELECT execution_id, payload, status, owner FROM inbox"
+                f" WHERE shard IN ({shard_list}) AND status = ? AND owner NOT IN ({','.join('?' * len(live))})"
+                f" ORDER BY submitted_at LIMIT ?",
+                (*shards, self.CLAIMED, *live, limit),
+            ).fetchall()
+            for execution_id, payload, status, owner in rows:
+                if len(claimed) >= limit:
+                    break
+                # Compare-and-set so two nodes with momentarily different rings cannot both claim
+                cur = self._conn.execute(
+                    "UPDATE inbox SET status = ?, owner = ?, claimed_at = ?"
+                    " WHERE execution_id = ? AND status = ? AND owner IS ?",
+                    (self.CLAIMED, self.node_id, now, execution_id, status, owner),
+                )
+                if cur.rowcount == 1:
+                    claimed.append((execution_id, json.loads(payload), status == self.CLAIMED))
+        return claimed
+
+    def release(self, execution_id: str):
+        """Returns a claimed submission to the inbox (e.g. when local admission is full)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE inbox SET status = ?, owner = NULL, claimed_at = NULL WHERE execution_id = ? AND owner = ?",
+                (self.PENDING, execution_id, self.node_id),
+            )
+
+    def finish(self, execution_id: str):
+        # Finished runs leave the inbox; the run journal keeps their history
+        with self._lock:
+            self._conn.execute("DELETE FROM inbox WHERE execution_id = ? AND owner = ?", (execution_id, self.node_id))
+
+    def leave(self):
+        """Graceful shutdown: drop the lease so survivors take over immediately."""
+        with self._lock:
+            self._conn.execute("DELETE FROM members WHERE node_id = ?", (self.node_id,))
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM inbox GROUP BY status").fetchall())
+            owned = self._conn.execute(
+                "SELECT COUNT(*) FROM inbox WHERE status = ? AND owner = ?", (self.CLAIMED, self.node_id)
+            ).fetchone()[0]
+        return {
+            "node_id": self.node_id,
+            "members": sorted(self.ring.nodes),
+            "pending": counts.get(self.PENDING, 0),
+            "claimed": counts.get(self.CLAIMED, 0),
+            "owned_by_this_node": owned,
+        }
@@ -0,0 +1,360 @@
+import asyncio
+import math
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from app.interfaces import ExecutionBackend, Task
+from app.core.dag import SimpleWorkflowDAG
+from app.core.scheduling import FairShareQueue
+
+# (task, rng) -> seconds of virtual time the task occupies a worker
+DurationModel = Callable[[Task, random.Random], float]
+# Probability that a task fails, fixed or per task
+FailureModel = Union[float, Callable[[Task], float]]
+
+POLICIES = ("fifo", "priority", "fair_share")
+
+
+class _VirtualSelector:
+    """Selector proxy that jumps the loop's clock instead of sleeping."""
+    def __init__(self, selector, loop: "VirtualClockLoop"):
+        self._selector = selector
+        self._loop = loop
+
+    def select(self, timeout=None):
+        if timeout is not None and timeout > 0:
+            # Nothing is ready before the next timer: advance straight to it
+            self._loop.advance(timeout)
+            timeout = 0
+        return self._selector.select(timeout)
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop on a virtual clock starting at 0. Whenever there is no ready callback,
+    time jumps to the next scheduled timer, so asyncio.sleep() and call_at() cost no
+    wall time. Real I/O and call_soon_threadsafe still work (polled without blocking).
+    """
+    def __init__(self):
+        self._now = 0.0
+        super().__init__()
+        self._selector = _VirtualSelector(self._selector, self)
+
+    def time(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float):
+        self._now += seconds
+
+
+# --- Duration models ---
+
+def fixed(seconds: float) -> DurationModel:
+    return lambda task, rng: seconds
+
+
+def uniform(low: float, high: float) -> DurationModel:
+    return lambda task, rng: rng.uniform(low, high)
+
+
+def exponential(mean: float) -> DurationModel:
+    return lambda task, rng: rng.expovariate(1.0 / mean)
+
+
+def lognormal(median: float, sigma: float) -> DurationModel:
+    # Long-tailed; the usual shape of real task durations
+    mu = math.log(median)
+    return lambda task, rng: rng.lognormvariate(mu, sigma)
+
+
+class HistoryModel:
+    """
+    Replays recorded executions: each task's duration is drawn from the durations
+    recorded for a task of the same name (all recorded durations when the name is
+    unknown), and fails at that task's recorded failure rate.
+    """
+    def __init__(self, durations: Dict[str, List[float]], failures: Optional[Dict[str, float]] = None):
+        if not any(durations.values()):
+            raise ValueError("History has no recorded task durations")
+        self.durations = {name: samples for name, samples in durations.items() if samples}
+        self.failures = failures or {}
+        self._pooled = [d for samples in self.durations.values() for d in samples]
+        total = sum(len(s) for s in self.durations.values())
+        self._pooled_failure_rate = sum(rate * len(self.durations.get(name, ()))
+                                        for name, rate in self.failures.items()) / total
+
+    @classmethod
+    def from_executions(cls, executions: Iterable[Any]) -> "HistoryModel":
+        """Builds a model from execution records (models or the dicts returned by GET /executions)."""
+        durations: Dict[str, List[float]] = {}
+        outcomes: Dict[str, List[int]] = {}
+        for execution in executions:
+            tasks = execution["tasks"] if isinstance(execution, dict) else execution.tasks
+            for task in tasks:
+                if not isinstance(task, dict):
+                    task = task.dict()
+                status = getattr(task["status"], "value", task["status"])
+                if status not in ("completed", "failed"):
+                    continue
+                counts = outcomes.setdefault(task["name"], [0, 0])
+                counts[status == "failed"] += 1
+                if task.get("duration") is not None:
+                    durations.setdefault(task["name"], []).append(task["duration"])
+        failures = {name: failed / (ok + failed) for name, (ok, failed) in outcomes.items()}
+        return cls(durations, failures)
+
+    def duration(self, task: Task, rng: random.Random) -> float:
+        return rng.choice(self.durations.get(task.name) or self._pooled)
+
+    def failure_rate(self, task: Task) -> float:
+        return self.failures.get(task.name, self._pooled_failure_rate)
+
+
+class SimulatedTaskFailure(Exception):
+    pass
+
+
+def _executes_for_real(task: Task) -> bool:
+    # Branch decisions steer the rest of the run, so they are evaluated
+    return getattr(task, "type_name", "") == "branch_python_task"
+
+
+class SimulationBackend(ExecutionBackend):
+    """
+    ExecutionBackend for a VirtualClockLoop: a fixed pool of simulated workers.
+    Tasks are not run; each occupies a worker for a sampled duration and then
+    succeeds (result None) or fails with its sampled failure rate. Tasks matching
+    execute (branch tasks by default) also run their real code, instantly.
+
+    Durations and failures come from a per-task RNG seeded by (seed, workflow, task),
+    and submissions arriving at the same instant are queued in name order, so a
+    seeded simulation is reproducible regardless of dispatch or hash order.
+
+    Policies:
+      - fifo: one queue in arrival order
+      - priority: strict priority bands, FIFO within a band
+      - fair_share: priority bands with weighted DRR across tenants (as LocalExecutionBackend)
+    """
+    # Submissions are collected for this long (virtual seconds) before being queued
+    QUANTUM = 1e-6
+
+    def __init__(self, workers: int = 5, duration: Union[DurationModel, HistoryModel] = fixed(1.0),
+                 failure_rate: Optional[FailureModel] = None, policy: str = "fifo",
+                 tenant_weights: Optional[Dict[str, float]] = None, seed: int = 0,
+                 execute: Callable[[Task], bool] = _executes_for_real):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}; expected one of {POLICIES}")
+        if isinstance(duration, HistoryModel):
+            if failure_rate is None:
+                failure_rate = duration.failure_rate
+            duration = duration.duration
+        self.workers = workers
+        self.duration = duration
+        self.failure_rate = failure_rate or 0.0
+        self.policy = policy
+        self.seed = seed
+        self.execute = execute
+        self._queue = deque() if policy == "fifo" else FairShareQueue(tenant_weights if policy == "fair_share" else None)
+        self._arrivals: List[tuple] = []
+        self._flush_scheduled = False
+        self._running = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.queue_delays: List[float] = []
+        self.busy_time = 0.0
+        self.completed = 0
+        self.failed = 0
+        self.peak_pending = 0
+
+    def submit_task(self, task: Task, priority: int = 0, tenant: Optional[str] = None, context: Any = None) -> asyncio.Future:
+        return self._submit([task], False, priority, tenant, context)
+
+    def submit_batch(self, tasks, priority: int = 0, tenant: Optional[str] = None, context: Any = None) -> asyncio.Future:
+        # Like LocalExecutionBackend, a batch holds one worker for the sum of its members
+        return self._submit(list(tasks), True, priority, tenant, context)
+
+    def _submit(self, tasks: List[Task], batch: bool, priority: int, tenant: Optional[str], context: Any) -> asyncio.Future:
+        if self._loop is None:
+            self._loop = asyncio.get_event_loop()
+        future = self._loop.create_future()
+        workflow_id = getattr(context, "workflow_id", None) or tenant or "default"
+        self._arrivals.append((workflow_id, tasks[0].name, tasks, batch, priority, tenant or "default",
+                               context, future, self._loop.time()))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._loop.call_at(self._loop.time() + self.QUANTUM, self._flush)
+        return future
+
+    def _flush(self):
+        self._flush_scheduled = False
+        arrivals, self._arrivals = self._arrivals, []
+        arrivals.sort(key=lambda a: (a[0], a[1]))
+        for workflow_id, _, tasks, batch, priority, tenant, context, future, submitted in arrivals:
+            item = (workflow_id, tasks, batch, context, future, submitted)
+            if self.policy == "fifo":
+                self._queue.append(item)
+            else:
+                self._queue.push(item, priority, tenant)
+        self.peak_pending = max(self.peak_pending, len(self._queue))
+        self._dispatch()
+
+    def _dispatch(self):
+        now = self._loop.time()
+        while self._running < self.workers and len(self._queue):
+            workflow_id, tasks, batch, context, future, submitted = (
+                self._queue.popleft() if self.policy == "fifo" else self._queue.pop())
+            if future.cancelled():
+                continue
+            outcomes = [self._sample(workflow_id, task, context) for task in tasks]
+            duration = sum(d for d, _ in outcomes)
+            self._running += 1
+            self.busy_time += duration
+            self.queue_delays.append(now - submitted)
+            self._loop.call_at(now + duration, self._finish, future, batch, outcomes)
+
+    def _sample(self, workflow_id: str, task: Task, context: Any) -> Tuple[float, Tuple[bool, Any]]:
+        rng = random.Random(f"{self.seed}:{workflow_id}:{task.name}")
+        duration = max(0.0, self.duration(task, rng))
+        rate = self.failure_rate(task) if callable(self.failure_rate) else self.failure_rate
+        if rng.random() < rate:
+            return duration, (False, SimulatedTaskFailure(f"Simulated failure of {task.name}"))
+        if self.execute(task):
+            try:
+                return duration, (True, task.execute(context))
+            except Exception as e:
+                return duration, (False, e)
+        return duration, (True, None)
+
+    def _finish(self, future: asyncio.Future, batch: bool, outcomes: list):
+        self._running -= 1
+        for _, (ok, _) in outcomes:
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+        self._dispatch()
+        if future.cancelled():
+            return
+        if batch:
+            future.set_result([outcome for _, outcome in outcomes])
+        else:
+            ok, value = outcomes[0][1]
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "policy": self.policy,
+            "running": self._running,
+            "pending": len(self._queue),
+            "peak_pending": self.peak_pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "busy_seconds": self.busy_time,
+        }
+
+
+@dataclass
+class SimulationReport:
+    """One point of a capacity curve: a workload run on `workers` workers under `policy`."""
+    workers: int
+    policy: str
+    workflows: int
+    failed_workflows: int
+    tasks: int
+    failed_tasks: int
+    makespan: float
+    utilization: float
+    mean_queue_delay: float
+    p95_queue_delay: float
+    max_queue_delay: float
+    peak_pending: int
+    wall_seconds: float
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def poisson_arrivals(count: int, rate: float, build_dag: Callable[[int], SimpleWorkflowDAG],
+                     seed: int = 0) -> Iterable[Tuple[float, SimpleWorkflowDAG]]:
+    """Yields (arrival time, dag) for count workflows arriving at rate per second; DAGs are built lazily."""
+    rng = random.Random(seed)
+    at = 0.0
+    for i in range(count):
+        yield at, build_dag(i)
+        at += rng.expovariate(rate)
+
+
+def simulate(arrivals: Iterable[Tuple[float, SimpleWorkflowDAG]], workers: int = 5, policy: str = "fifo",
+             duration: Union[DurationModel, HistoryModel] = fixed(1.0), failure_rate: Optional[FailureModel] = None,
+             seed: int = 0, tenant_weights: Optional[Dict[str, float]] = None,
+             engine_options: Optional[Dict[str, Any]] = None) -> SimulationReport:
+    """
+    Runs every workflow of arrivals (sorted by arrival time) through an
+    AdvancedWorkflowEngine on a SimulationBackend, on a fresh VirtualClockLoop.
+    """
+    from app.core.engine import AdvancedWorkflowEngine
+    from app.interfaces import TaskStatus
+
+    backend = SimulationBackend(workers, duration, failure_rate, policy, tenant_weights, seed)
+
+    async def main():
+        engine = AdvancedWorkflowEngine(backend, **(engine_options or {}))
+        loop = asyncio.get_event_loop()
+        runs = []
+        for at, dag in arrivals:
+            if at > loop.time():
+                await asyncio.sleep(at - loop.time())
+            runs.append(asyncio.ensure_future(engine.run(dag)))
+        results = await asyncio.gather(*runs)
+        return sum(1 for r in results if r.status == TaskStatus.FAILED), len(results)
+
+    loop = VirtualClockLoop()
+    started = time.perf_counter()
+    try:
+        failed_workflows, workflows = loop.run_until_complete(main())
+        makespan = loop.time()
+    finally:
+        loop.close()
+    delays = backend.queue_delays
+    return SimulationReport(
+        workers=workers,
+        policy=policy,
+        workflows=workflows,
+        failed_workflows=failed_workflows,
+        tasks=backend.completed + backend.failed,
+        failed_tasks=backend.failed,
+        makespan=makespan,
+        utilization=backend.busy_time / (workers * makespan) if makespan else 0.0,
+        mean_queue_delay=sum(delays) / len(delays) if delays else 0.0,
+        p95_queue_delay=_percentile(delays, 0.95),
+        max_queue_delay=max(delays, default=0.0),
+        peak_pending=backend.peak_pending,
+        wall_seconds=time.perf_counter() - started,
+    )
+
+
+def sweep(workload: Callable[[], Iterable[Tuple[float, SimpleWorkflowDAG]]], worker_counts: Iterable[int],
+          policies: Iterable[str] = ("fifo",), **options) -> List[SimulationReport]:
+    """
+    Capacity curves: simulates the same workload (a fresh iterable per point) for
+    every policy and worker count. Options are passed to simulate().
+    """
+    return [simulate(workload(), workers, policy, **options)
+            for policy in policies for workers in worker_counts]
@@ -1,26 +1,45 @@
+import logging
 from dataclasses import dataclass, field
 from typing import Any, Dict, Callable
 from app.interfaces import Task
 from app.utils.registry import TaskRegistryMeta
 from app.utils.descriptors import TaskConfigDescriptor
+from app.core.triggers import TriggerRule
+from app.core.logs import TASK_LOGGER
+
+logger = logging.getLogger(TASK_LOGGER)
 
 @dataclass
 class TaskContext:
     workflow_id: str
     run_id: str
     global_params: Dict[str, Any] = field(default_factory=dict)
+    # Parent task name -> ResultHandle; call .get() to read the upstream output
     task_results: Dict[str, Any] = field(default_factory=dict)
 
+    @property
+    def log(self) -> logging.Logger:
+        # Records are attributed to the executing task and captured per task (see app.core.logs)
+        return logger
+
 class BaseTask(Task, metaclass=TaskRegistryMeta):
     """
     Base Task class demonstrating Metaclass usage and Descriptor validation.
     """
     # Descriptor to validate configuration dict
     config = TaskConfigDescriptor(required_keys=['retries'])
+    # Cheap tasks may be micro-batched by the engine (opt in per class or via params["cheap"])
+    cheap = False
+    # When the task runs relative to its parents' outcomes (override via params["trigger_rule"])
+    trigger_rule = TriggerRule.ALL_SUCCESS
 
     def __init__(self, name: str, params: Dict[str, Any] = None):
         self.name = name
         self.params = params or {}
+        if 'cheap' in self.params:
+            self.cheap = bool(self.params['cheap'])
+        if 'trigger_rule' in self.params:
+            self.trigger_rule = TriggerRule(self.params['trigger_rule'])
         # Decorator Pattern simulated here potentially, but simpler to just use composition
         self.config = {'retries': self.params.get('retries', 3), **self.params} 
 
@@ -42,6 +61,6 @@ class PythonFunctionTask(BaseTask):
         return callable(self.action)
 
     def execute(self, context: TaskContext) -> Any:
-        print(f"Executing Python Task: {self.name} with params: {self.params}")
+        logger.debug("Executing Python Task: %s with params: %s", self.name, self.params)
         # Passing context directly to action if it expects it
         return self.action(context, self.params)
@@ -0,0 +1,48 @@
+from enum import Enum
+from typing import Optional
+
+from app.interfaces import TaskStatus
+
+
+class TriggerRule(str, Enum):
+    """
+    When a task may run, given the outcomes of its upstream tasks.
+    A failed or upstream_failed parent counts as failed; a skipped parent
+    (including a branch child that was not chosen) counts as skipped.
+    """
+    ALL_SUCCESS = "all_success"  # every parent succeeded (default)
+    ALL_DONE = "all_done"        # every parent finished, whatever the outcome
+    ONE_SUCCESS = "one_success"  # at least one parent succeeded
+    NONE_FAILED = "none_failed"  # no parent failed; skipped parents are fine
+
+
+# Verdict meaning "ready to run"; the other verdicts are terminal TaskStatus values
+RUN = "run"
+
+SUCCESS, FAILED, SKIPPED = 0, 1, 2
+
+
+def evaluate(rule: TriggerRule, succeeded: int, failed: int, skipped: int, remaining: int) -> Optional[str]:
+    """
+    Decides a task from its upstream counters. Returns RUN, TaskStatus.SKIPPED or
+    TaskStatus.UPSTREAM_FAILED as soon as the outcome is certain, or None while
+    it still depends on parents that have not finished (remaining > 0).
+    """
+    if rule == TriggerRule.ALL_SUCCESS:
+        if failed:
+            return TaskStatus.UPSTREAM_FAILED
+        if skipped:
+            return TaskStatus.SKIPPED
+        return RUN if not remaining else None
+    if rule == TriggerRule.NONE_FAILED:
+        if failed:
+            return TaskStatus.UPSTREAM_FAILED
+        return RUN if not remaining else None
+    if rule == TriggerRule.ONE_SUCCESS:
+        if succeeded:
+            return RUN
+        if remaining:
+            return None
+        return TaskStatus.UPSTREAM_FAILED if failed else TaskStatus.SKIPPED
+    # ALL_DONE
+    return RUN if not remaining else None
@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
 from enum import Enum
 from concurrent.futures import Future
+import threading
 
 class TaskStatus(str, Enum):
     PENDING = "pending"
@@ -9,6 +10,7 @@ class TaskStatus(str, Enum):
     COMPLETED = "completed"
     FAILED = "failed"
     SKIPPED = "skipped"
+    UPSTREAM_FAILED = "upstream_failed"
     WAITING_APPROVAL = "waiting_approval"
 
 class Task(ABC):
@@ -46,5 +48,42 @@ class WorkflowEngine(ABC):
 
 class ExecutionBackend(ABC):
     @abstractmethod
-    def submit_task(self, task: Task) -> Future:
+    def submit_task(self, task: Task, priority: int = 0, tenant: Optional[str] = None, context: Any = None) -> Future:
+        """
+        Schedules a task. Higher priority is dispatched first; tenant (owner or
+        workflow) is the fair-share key within a priority band. context is the
+        run's TaskContext; backends build a default one when it is omitted.
+        """
         pass
+
+    def submit_batch(self, tasks: List[Task], priority: int = 0, tenant: Optional[str] = None, context: Any = None) -> Future:
+        """
+        Schedules a micro-batch of tasks. The returned future resolves to one
+        (ok, result_or_exception) pair per task, in order. The default submits each
+        task individually; backends override it to run the batch as one unit.
+        """
+        batch = Future()
+        batch.set_running_or_notify_cancel()
+        futures = [self.submit_task(t, priority, tenant, context) for t in tasks]
+        remaining = [len(futures)]
+        # Callbacks run on the backend's threads, or on this one for futures already done
+        lock = threading.Lock()
+
+        def _done(_):
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                batch.set_result([
+                    (True, f.result()) if f.exception() is None else (False, f.exception()) for f in futures
+                ])
+        for f in futures:
+            f.add_done_callback(_done)
+        return batch
+
+    def saturated(self) -> bool:
+        """Backpressure signal: True while the engine should hold back new dispatches."""
+        return False
+
+    def metrics(self) -> Dict[str, Any]:
+        return {}
@@ -1,20 +1,32 @@
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 import asyncio
 import json
+import os
 from datetime import datetime
 import uuid
 
 from app.core.engine import AdvancedWorkflowEngine
 from app.core.backend import LocalExecutionBackend
+from app.core.autoscaling import ScalingPolicy
+from app.core.queue_backend import DurableQueueBackend, DurableTaskQueue
 from app.core.dag import SimpleWorkflowDAG
 from app.core.task import PythonFunctionTask
-from app.core.extensions import BranchPythonTask
+from app.core.extensions import BranchPythonTask, MappedTask
 from app.core.patterns import Observer
+from app.core.journal import JournalState, RunJournal
+from app.core.incremental import plan_incremental
+from app.core.cache import ResultCache
+from app.core.results import ResultStore, ResultHandle, preview_text
+from app.core.sharding import ShardCoordinator
+from app.core.admission import AdmissionController, AdmissionTicket, AdmissionRejected
+from app.core.logs import TaskLogging
+from app.api import actions
 from app.api.models import (
     WorkflowCreateRequest, WorkflowModel, WorkflowExecutionModel, 
-    TaskType, TaskConfig, TaskResult, TaskStatusState
+    TaskType, TaskConfig, TaskResult, TaskStatusState,
+    WorkflowBatchRequest, WorkflowBatchResponse, TaskLogEntry, TaskLogsResponse
 )
 
 app = FastAPI(title="PyTaskFlow API", version="0.1.0")
@@ -29,6 +41,20 @@ app.add_middleware(
 )
 
 # --- In-Memory Database ---
+# Task results are stored as a truncated preview; full outputs live with the engine
+RESULT_PREVIEW_CHARS = int(os.environ.get("PYTASKFLOW_RESULT_PREVIEW_CHARS", "256"))
+
+def preview_result(result: Any) -> Optional[str]:
+    if isinstance(result, ResultHandle):
+        return result.preview(RESULT_PREVIEW_CHARS)
+    if not result:
+        return None
+    if isinstance(result, (bytes, bytearray, memoryview)):
+        return f"<{len(result)} bytes>"
+    return preview_text(result, RESULT_PREVIEW_CHARS)
+
+TERMINAL_TASK_STATES = ["completed", "failed", "skipped", "upstream_failed"]
+
 class InMemoryDB:
     def __init__(self):
         self.workflows: Dict[str, WorkflowModel] = {}
@@ -46,6 +72,9 @@ class InMemoryDB:
     def create_execution(self, execution: WorkflowExecutionModel):
         self.executions[execution.id] = execution
 
+    def create_executions(self, executions: List[WorkflowExecutionModel]):
+        self.executions.update((e.id, e) for e in executions)
+
     def get_executions(self, workflow_id: str = None) -> List[WorkflowExecutionModel]:
         if workflow_id:
             return [e for e in self.executions.values() if e.workflowId == workflow_id]
@@ -64,25 +93,82 @@ class InMemoryDB:
                         t.endTime = datetime.now()
                         if t.startTime:
                             t.duration = (t.endTime - t.startTime).total_seconds()
-                    t.result = str(result) if result else None
+                    t.result = preview_result(result)
                     found = True
                     break
             
-            if status in ["completed", "failed"]:
-                all_done = all(t.status in ["completed", "failed", "skipped"] for t in exec_model.tasks)
+            if status in TERMINAL_TASK_STATES:
+                all_done = all(t.status in TERMINAL_TASK_STATES for t in exec_model.tasks)
                 if all_done:
-                    exec_model.status = "completed"
+                    failed = any(t.status in ["failed", "upstream_failed"] for t in exec_model.tasks)
+                    exec_model.status = "failed" if failed else "completed"
                     exec_model.endTime = datetime.now()
                     exec_model.duration = (exec_model.endTime - exec_model.startTime).total_seconds()
-            
-            if status == "failed":
-                exec_model.status = "failed"
-                exec_model.endTime = datetime.now()
 
 db = InMemoryDB()
-backend = LocalExecutionBackend(max_workers=10)
+if os.environ.get("PYTASKFLOW_BACKEND", "local") == "queue":
+    # Durable queue: tasks run in separate `python -m app.worker` processes
+    backend = DurableQueueBackend(
+        DurableTaskQueue(os.environ.get("PYTASKFLOW_QUEUE", "pytaskflow_queue.db")),
+        max_depth=int(os.environ.get("PYTASKFLOW_QUEUE_MAX_DEPTH", "10000"))
+    )
+else:
+    # Fair-share dispatch across owners; optional per-owner weights.
+    # Setting PYTASKFLOW_MIN_WORKERS enables queue-lag driven pool autoscaling.
+    backend = LocalExecutionBackend(
+        max_workers=int(os.environ.get("PYTASKFLOW_MAX_WORKERS", "10")),
+        tenant_weights=json.loads(os.environ.get("PYTASKFLOW_TENANT_WEIGHTS", "{}")),
+        scaling=ScalingPolicy(
+            min_workers=int(os.environ["PYTASKFLOW_MIN_WORKERS"]),
+            max_workers=int(os.environ.get("PYTASKFLOW_MAX_WORKERS", "10"))
+        ) if "PYTASKFLOW_MIN_WORKERS" in os.environ else None
+    )
+# Crash-safe run journal: in-flight runs are resumed from it on startup
+journal = RunJournal(os.environ.get("PYTASKFLOW_JOURNAL", "pytaskflow_journal.db"))
 # Use Advanced Engine with Observer support
-engine = AdvancedWorkflowEngine(backend)
+engine = AdvancedWorkflowEngine(
+    backend,
+    journal=journal,
+    max_active_tasks=int(os.environ.get("PYTASKFLOW_MAX_ACTIVE_TASKS", "200")),
+    # Opt-in micro-batching of tasks submitted with params {"cheap": true}
+    batch_size=int(os.environ["PYTASKFLOW_BATCH_SIZE"]) if "PYTASKFLOW_BATCH_SIZE" in os.environ else None,
+    # Opt-in content-addressed result cache (memory LRU + mmap'd disk blobs)
+    cache=ResultCache(
+        memory_bytes=int(os.environ.get("PYTASKFLOW_CACHE_MEMORY_MB", "64")) * 1024 * 1024,
+        disk_dir=os.environ.get("PYTASKFLOW_CACHE_DIR"),
+        ttl=float(os.environ["PYTASKFLOW_CACHE_TTL"]) if "PYTASKFLOW_CACHE_TTL" in os.environ else None
+    ) if os.environ.get("PYTASKFLOW_CACHE", "") == "1" else None,
+    # Task outputs above this size are spilled to mmap'd files instead of held in memory
+    result_store=ResultStore(
+        root=os.environ.get("PYTASKFLOW_SPILL_DIR"),
+        spill_threshold=int(os.environ.get("PYTASKFLOW_SPILL_BYTES", str(1024 * 1024)))
+    ),
+    # Cap on result bytes held in memory across live runs; larger results are spilled first
+    memory_budget=int(os.environ["PYTASKFLOW_RUN_MEMORY_MB"]) * 1024 * 1024 if "PYTASKFLOW_RUN_MEMORY_MB" in os.environ else None
+)
+# Admission control: global/owner/tag run quotas with a bounded wait queue
+admission = AdmissionController(
+    max_concurrent_runs=int(os.environ.get("PYTASKFLOW_MAX_RUNS", "50")),
+    max_queue_depth=int(os.environ.get("PYTASKFLOW_ADMISSION_QUEUE", "1000")),
+    owner_quota=int(os.environ["PYTASKFLOW_OWNER_QUOTA"]) if "PYTASKFLOW_OWNER_QUOTA" in os.environ else None,
+    tag_quotas=json.loads(os.environ.get("PYTASKFLOW_TAG_QUOTAS", "{}"))
+)
+
+# Per-task log capture: bounded ring buffers, plus a rotated file written by a background thread
+task_logging = TaskLogging(
+    lines_per_task=int(os.environ.get("PYTASKFLOW_LOG_LINES", "500")),
+    max_tasks=int(os.environ.get("PYTASKFLOW_LOG_TASKS", "10000")),
+    log_dir=os.environ.get("PYTASKFLOW_LOG_DIR"),
+    max_bytes=int(os.environ.get("PYTASKFLOW_LOG_MAX_MB", "10")) * 1024 * 1024,
+    backup_count=int(os.environ.get("PYTASKFLOW_LOG_BACKUPS", "5"))
+)
+
+# Orchestrator sharding across processes (e.g. uvicorn --workers N) over a shared store
+coordinator = ShardCoordinator(
+    os.environ["PYTASKFLOW_SHARDS_DB"],
+    lease_ttl=float(os.environ.get("PYTASKFLOW_SHARD_LEASE_TTL", "30"))
+) if os.environ.get("PYTASKFLOW_SHARDS_DB") else None
+SHARD_POLL_INTERVAL = 0.5
 
 # --- WebSocket ---
 class ConnectionManager:
@@ -101,6 +187,29 @@ class ConnectionManager:
                 pass
 manager = ConnectionManager()
 
+class BackendEventObserver(Observer):
+    """
+    Forwards backend events (e.g. pool_resized from the autoscaler thread) to WebSocket clients.
+    """
+    def __init__(self):
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def update(self, event: str, data: any):
+        if self.loop:
+            asyncio.run_coroutine_threadsafe(manager.broadcast({
+                "event": event,
+                "data": data,
+                "timestamp": str(datetime.now())
+            }), self.loop)
+
+backend_observer = BackendEventObserver()
+if isinstance(backend, LocalExecutionBackend):
+    backend.attach(backend_observer)
+
+@app.on_event("startup")
+async def bind_backend_observer():
+    backend_observer.loop = asyncio.get_running_loop()
+
 # --- Observer Bridge ---
 class WebSocketObserver(Observer):
     """
@@ -157,18 +266,32 @@ def notify_wrapper(event: str, data: any = None):
         status_map = {
             "task_started": "running",
             "task_completed": "completed",
-            "task_failed": "failed"
+            "task_cached": "completed",
+            "task_failed": "failed",
+            "task_skipped": "skipped",
+            "task_upstream_failed": "upstream_failed"
         }
         
         if event in status_map and task_name:
             db.update_execution_task(execution_id, task_name, status_map[event], data.get("result"))
-            
-        asyncio.create_task(manager.broadcast({
+
+        message = {
             "event": event, 
             "workflow_id": execution_id,
             "task": task_name,
             "timestamp": str(datetime.now())
-        }))
+        }
+        if event == "task_batch_completed":
+            # One store pass and one broadcast for a whole micro-batch
+            for item in data["tasks"]:
+                db.update_execution_task(execution_id, item["task"], "completed", item["result"])
+            message["tasks"] = [item["task"] for item in data["tasks"]]
+        elif event == "task_batch_started":
+            for name in data["tasks"]:
+                db.update_execution_task(execution_id, name, "running")
+            message["tasks"] = data["tasks"]
+            
+        asyncio.create_task(manager.broadcast(message))
 
 # Attach the wrapper (monkey-patching Subject.notify for simplicity in this demo context)
 # Ideally we use engine.attach(Observer), but that requires defining a class that has access to 'db' and 'manager'.
@@ -178,21 +301,13 @@ engine.notify = notify_wrapper
 # --- Helpers ---
 def create_task_from_config(config: TaskConfig):
     if config.type == TaskType.PYTHON:
-        def dummy_action(ctx, cfg):
-            import time
-            import random
-            # Sim different durations
-            time.sleep(random.uniform(0.5, 2.0)) 
-            if random.random() < 0.1: # 10% fail chance
-                raise Exception("Random Failure")
-            return f"Processed {cfg.get('name')}"
-        return PythonFunctionTask(config.name, dummy_action, config.params)
+        return PythonFunctionTask(config.name, actions.simulated_action, config.params)
     elif config.type == TaskType.BRANCH:
-        def branch_action(ctx, cfg):
-            return cfg.get('params', {}).get('next', [])
-        return BranchPythonTask(config.name, branch_action, config.params)
+        return BranchPythonTask(config.name, actions.branch_action, config.params)
+    elif config.type == TaskType.MAP:
+        return MappedTask(config.name, actions.map_action, config.params, reduce=actions.collect_reduce)
     else:
-        return PythonFunctionTask(config.name, lambda c, k: "OK", {})
+        return PythonFunctionTask(config.name, actions.noop_action, {})
 
 # --- Endpoints ---
 @app.get("/")
@@ -207,11 +322,75 @@ def list_workflows():
 def list_executions(workflow_id: Optional[str] = None):
     return db.get_executions(workflow_id)
 
-@app.post("/workflows", response_model=WorkflowExecutionModel)
-async def submit_workflow(request: WorkflowCreateRequest):
-    # 1. Store Workflow Metadata (Definition)
-    execution_id = f"{request.id}-{str(uuid.uuid4())[:8]}"
-    
+def make_run(dag: SimpleWorkflowDAG, exec_model: WorkflowExecutionModel):
+    """Deferred run handed to admission control; the run starts only once admitted."""
+    async def run():
+        if exec_model.status == "queued":
+            exec_model.status = "running"
+        try:
+            result = await engine.run(dag)
+            if exec_model.status == "running":
+                # No task event closed the execution (e.g. every task was reused)
+                exec_model.status = result.status.value
+                exec_model.endTime = datetime.now()
+                exec_model.duration = (exec_model.endTime - exec_model.startTime).total_seconds()
+        finally:
+            # Only previews are kept past the run; drop its spilled outputs
+            engine.result_store.release_run(dag.workflow_id)
+            if coordinator:
+                await asyncio.to_thread(coordinator.finish, dag.workflow_id)
+    return run
+
+class CompiledWorkflow:
+    """
+    A validated workflow definition with its task objects built and dependency
+    edges resolved once. Tasks hold no per-run state, so every execution of the
+    definition shares them; instantiating only wires up a fresh DAG.
+    Raises ValueError when a task cannot be built or fails validation.
+    """
+    def __init__(self, request: WorkflowCreateRequest):
+        self.request = request
+        self.payload = request.model_dump(mode="json")
+        self.tasks = {}
+        for t_conf in request.tasks:
+            try:
+                task = create_task_from_config(t_conf)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Invalid task '{t_conf.name}': {e}") from e
+            if not task.validate():
+                raise ValueError(f"Invalid task '{t_conf.name}': incomplete {t_conf.type.value} task params")
+            self.tasks[t_conf.name] = task
+        self.edges = [(dep, t.name) for t in request.tasks for dep in t.dependencies if dep in self.tasks]
+
+    def instantiate(self, execution_id: str, params: Optional[Dict[str, Any]] = None):
+        """Builds the DAG and the initial task records for one execution."""
+        request = self.request
+        dag = SimpleWorkflowDAG(execution_id) 
+        dag.metadata = {"request": self.payload, "params": params or {}}
+        dag.params = dict(params or {})
+        dag.priority = request.priority
+        dag.tenant = request.owner
+        
+        for task in self.tasks.values():
+            dag.add_task(task)
+        for dep, child in self.edges:
+            dag.add_dependency(dag.tasks[dep], dag.tasks[child])
+        return dag, self.initial_tasks()
+
+    def initial_tasks(self) -> List[TaskResult]:
+        # Initialize Execution History Record
+        return [
+            TaskResult(id=t_conf.name, name=t_conf.name, status=TaskStatusState.PENDING)
+            for t_conf in self.request.tasks
+        ]
+
+def compile_definition(request: WorkflowCreateRequest) -> CompiledWorkflow:
+    try:
+        return CompiledWorkflow(request)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+def register_definition(request: WorkflowCreateRequest):
     # Store Definition if new
     if not db.get_workflow(request.id):
         wf_model = WorkflowModel(
@@ -222,49 +401,296 @@ async def submit_workflow(request: WorkflowCreateRequest):
             tags=request.tags,
             owner=request.owner,
             tasks=request.tasks,
+            priority=request.priority,
+            incremental=request.incremental,
             createdAt=datetime.now(),
             updatedAt=datetime.now()
         )
         db.save_workflow(wf_model)
 
-    # 2. Build DAG
-    dag = SimpleWorkflowDAG(execution_id) 
-    
-    # Initialize Execution History Record
-    initial_tasks = []
-    task_map = {}
-    
-    for t_conf in request.tasks:
-        task = create_task_from_config(t_conf)
-        dag.add_task(task)
-        task_map[t_conf.name] = task
-        initial_tasks.append(TaskResult(
-            id=t_conf.name,
-            name=t_conf.name,
-            status=TaskStatusState.PENDING
-        ))
-        
-    for t_conf in request.tasks:
-        parent = task_map[t_conf.name]
-        for dep in t_conf.dependencies:
-             if dep in task_map:
-                 dag.add_dependency(task_map[dep], parent)
+def new_execution(compiled: CompiledWorkflow, params: Optional[Dict[str, Any]] = None,
+                  baseline: Optional[JournalState] = None):
+    """
+    Creates a queued execution. Without sharding its run goes straight to local
+    admission control; with sharding it is routed to the ring owner of its id, and
+    the returned record is only a receipt: the owner creates and updates the
+    execution record when it claims the run (see shard_loop), so callers must not
+    store it here.
+    """
+    request = compiled.request
+    execution_id = f"{request.id}-{str(uuid.uuid4())[:8]}"
+    if coordinator:
+        coordinator.route(execution_id, {"request": compiled.payload, "params": params or {}})
+        return WorkflowExecutionModel(
+            id=execution_id,
+            workflowId=request.id,
+            workflowName=request.name,
+            status="queued",
+            tasks=compiled.initial_tasks(),
+            startTime=datetime.now(),
+            params=params or {}
+        )
+    return admit_execution(compiled, execution_id, params, baseline=baseline)
 
+def admit_execution(compiled: CompiledWorkflow, execution_id: str, params: Optional[Dict[str, Any]] = None,
+                    triggered_by: str = "manual", force: bool = False, baseline: Optional[JournalState] = None):
+    """
+    Builds the DAG and hands its run to local admission control.
+    baseline: the workflow's last successful run (see find_baseline), for incremental re-runs.
+    """
+    request = compiled.request
+    dag, initial_tasks = compiled.instantiate(execution_id, params)
+    if triggered_by != "manual":
+        # Recovered/taken-over runs: reflect what the journal says already happened
+        apply_replay(initial_tasks, journal.replay(execution_id))
+    elif request.incremental and baseline is not None:
+        plan_reuse(compiled, dag, initial_tasks, params, baseline)
     exec_model = WorkflowExecutionModel(
         id=execution_id,
         workflowId=request.id,
         workflowName=request.name,
-        status="running",
+        status="queued",
         tasks=initial_tasks,
-        startTime=datetime.now()
+        startTime=datetime.now(),
+        triggeredBy=triggered_by,
+        params=params or {}
     )
-    db.create_execution(exec_model)
-    
-    # 3. Process
-    asyncio.create_task(engine.run(dag))
+    # Raises AdmissionRejected when the admission queue is full
+    admission.submit(AdmissionTicket(execution_id, request.owner, request.tags), make_run(dag, exec_model), force=force)
+    return exec_model
+
+async def find_baseline(compiled: CompiledWorkflow) -> Optional[JournalState]:
+    """Last successful execution of an incremental workflow, replayed from the journal off the event loop."""
+    if not compiled.request.incremental:
+        return None
+    return await asyncio.to_thread(journal.last_successful_run, compiled.request.id)
+
+def plan_reuse(compiled: CompiledWorkflow, dag: SimpleWorkflowDAG, initial_tasks: List[TaskResult],
+               params: Optional[Dict[str, Any]], baseline: JournalState):
+    """
+    Incremental re-run: diffs the definition against the last successful execution
+    of the same workflow id (from the journal) and carries over unaffected outputs.
+    """
+    dag.reuse = plan_incremental(dag, compiled.payload, params or {}, baseline)
+    for t in initial_tasks:
+        if t.name in dag.reuse:
+            t.status = TaskStatusState.COMPLETED
+            t.result = preview_result(dag.reuse[t.name])
+            t.message = f"Reused from {baseline.run_id}"
+
+def apply_replay(initial_tasks: List[TaskResult], replayed):
+    for t in initial_tasks:
+        if t.name in replayed.completed:
+            t.status = TaskStatusState.COMPLETED
+            t.result = preview_result(replayed.completed[t.name])
+        elif t.name in replayed.failed:
+            t.status = TaskStatusState.FAILED
+        elif t.name in replayed.skipped:
+            t.status = TaskStatusState.SKIPPED
+        elif t.name in replayed.upstream_failed:
+            t.status = TaskStatusState.UPSTREAM_FAILED
+
+@app.post("/workflows", response_model=WorkflowExecutionModel)
+async def submit_workflow(request: WorkflowCreateRequest):
+    # 1. Build DAG, Admit & Process
+    compiled = compile_definition(request)
+    try:
+        exec_model = new_execution(compiled, baseline=await find_baseline(compiled))
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+    # 2. Store Workflow Metadata (Definition) once the run was accepted
+    register_definition(request)
+    if not coordinator:
+        db.create_execution(exec_model)
     
     return exec_model
 
+@app.post("/workflows/batch", response_model=WorkflowBatchResponse)
+async def submit_workflow_batch(request: WorkflowBatchRequest):
+    """
+    Submits many executions in one request: each distinct definition is compiled
+    once, all execution records are inserted in one store operation and only the
+    execution ids are returned. A rejected batch (404/422/429) registers nothing.
+    """
+    compiled: Dict[str, CompiledWorkflow] = {}
+    for definition in request.definitions:
+        compiled[definition.id] = compile_definition(definition)
+
+    # Resolve every reference before anything is admitted, so a bad batch is rejected whole
+    for item in request.executions:
+        if item.workflowId not in compiled:
+            stored = db.get_workflow(item.workflowId)
+            if not stored:
+                raise HTTPException(status_code=404, detail=f"Unknown workflow '{item.workflowId}'")
+            compiled[item.workflowId] = compile_definition(WorkflowCreateRequest(**stored.model_dump()))
+
+    baselines = {wf_id: await find_baseline(c) for wf_id, c in compiled.items()}
+    accepted: List[WorkflowExecutionModel] = []
+    rejected = 0
+    retry_after = None
+    for item in request.executions:
+        try:
+            accepted.append(new_execution(compiled[item.workflowId], item.params, baselines[item.workflowId]))
+        except AdmissionRejected as e:
+            rejected += 1
+            retry_after = e.retry_after
+    if not accepted and rejected:
+        raise HTTPException(status_code=429, detail="Admission queue full", headers={"Retry-After": str(retry_after)})
+    for definition in request.definitions:
+        register_definition(definition)
+    if not coordinator:
+        db.create_executions(accepted)
+    return WorkflowBatchResponse(executionIds=[e.id for e in accepted], rejected=rejected, retryAfter=retry_after)
+
+@app.get("/admission")
+def admission_metrics():
+    metrics = admission.metrics()
+    metrics["active_tasks"] = engine.active_tasks
+    metrics["max_active_tasks"] = engine.max_active_tasks
+    metrics["backend"] = backend.metrics()
+    if engine.cache:
+        metrics["cache"] = engine.cache.metrics()
+    metrics["results"] = engine.result_store.metrics()
+    metrics["engine"] = engine.metrics()
+    metrics["logs"] = task_logging.metrics()
+    return metrics
+
+@app.on_event("startup")
+async def resume_journaled_runs():
+    """
+    Replays the run journal and resumes every run that was in flight when the
+    previous process died. Completed tasks are restored, never re-run.
+    With sharding, survivors take over a dead node's runs instead (see shard_loop).
+    """
+    if coordinator:
+        return
+    for execution_id, replayed in journal.unfinished_runs().items():
+        payload = replayed.metadata.get("request")
+        if not payload:
+            continue
+        compiled = CompiledWorkflow(WorkflowCreateRequest(**payload))
+        # Recovered runs were already admitted once; they bypass the queue bound
+        db.create_execution(admit_execution(
+            compiled, execution_id, replayed.metadata.get("params") or {}, triggered_by="recovery", force=True
+        ))
+
+async def shard_loop():
+    """
+    Renews this node's shard lease and runs the executions it owns on the
+    consistent-hash ring, including unfinished ones left by nodes that died.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(coordinator.heartbeat)
+            claimed = await asyncio.to_thread(coordinator.claim)
+        except Exception:
+            claimed = []
+        for i, (execution_id, payload, taken_over) in enumerate(claimed):
+            compiled = CompiledWorkflow(WorkflowCreateRequest(**payload["request"]))
+            try:
+                exec_model = admit_execution(
+                    compiled, execution_id, payload.get("params"),
+                    triggered_by="takeover" if taken_over else "manual",
+                    baseline=None if taken_over else await find_baseline(compiled)
+                )
+            except AdmissionRejected:
+                # Local admission is full: hand the rest back to the inbox for later
+                for rest_id, _, _ in claimed[i:]:
+                    await asyncio.to_thread(coordinator.release, rest_id)
+                break
+            db.create_execution(exec_model)
+        await asyncio.sleep(SHARD_POLL_INTERVAL)
+
+@app.on_event("startup")
+async def start_sharding():
+    if coordinator:
+        app.state.shard_task = asyncio.create_task(shard_loop())
+
+@app.on_event("shutdown")
+async def stop_sharding():
+    if coordinator:
+        app.state.shard_task.cancel()
+        coordinator.leave()
+
+@app.on_event("startup")
+async def start_task_logging():
+    task_logging.start()
+
+@app.on_event("shutdown")
+async def stop_task_logging():
+    task_logging.stop()
+
+@app.on_event("shutdown")
+async def stop_autoscaler():
+    # Only the local backend autoscales (PYTASKFLOW_MIN_WORKERS)
+    autoscaler = getattr(backend, "autoscaler", None)
+    if autoscaler:
+        autoscaler.stop()
+
+def log_entry(entry) -> TaskLogEntry:
+    created, level, message = entry
+    return TaskLogEntry(timestamp=datetime.fromtimestamp(created), level=level, message=message)
+
+@app.get("/executions/{execution_id}/tasks/{task_name}/logs", response_model=TaskLogsResponse)
+def get_task_logs(execution_id: str, task_name: str, tail: int = 100):
+    """Last `tail` captured log lines of one task (0 = everything still buffered)."""
+    if execution_id not in db.executions:
+        if coordinator:
+            # Records live on the node running the execution
+            raise HTTPException(status_code=404, detail=f"Execution not found on this node; "
+                                                        f"its shard owner is {coordinator.owner_of(execution_id)}")
+        raise HTTPException(status_code=404, detail="Execution not found")
+    lines = task_logging.buffer.tail(execution_id, task_name, tail)
+    return TaskLogsResponse(executionId=execution_id, task=task_name, lines=[log_entry(e) for e in lines])
+
+@app.websocket("/ws/executions/{execution_id}/tasks/{task_name}/logs")
+async def follow_task_logs(websocket: WebSocket, execution_id: str, task_name: str, tail: int = 100):
+    """Sends the last `tail` lines, then every new line of the task as it is logged."""
+    await websocket.accept()
+    loop = asyncio.get_running_loop()
+    lines: asyncio.Queue = asyncio.Queue(maxsize=1000)
+
+    def offer(entry):
+        # A follower that cannot keep up loses lines rather than slowing the task down
+        if not lines.full():
+            lines.put_nowait(entry)
+
+    snapshot, unsubscribe = task_logging.buffer.follow(
+        execution_id, task_name, lambda entry: loop.call_soon_threadsafe(offer, entry), tail
+    )
+    # Watch the socket so a silent task does not keep a closed follower subscribed
+    closed = asyncio.ensure_future(websocket.receive_text())
+    next_line = None
+    try:
+        for entry in snapshot:
+            await websocket.send_json(log_entry(entry).model_dump(mode="json"))
+        while True:
+            if next_line is None:
+                next_line = asyncio.ensure_future(lines.get())
+            done, _ = await asyncio.wait({next_line, closed}, return_when=asyncio.FIRST_COMPLETED)
+            if closed in done:
+                if closed.exception() is not None:
+                    break
+                # Client messages are ignored
+                closed = asyncio.ensure_future(websocket.receive_text())
+            if next_line in done:
+                await websocket.send_json(log_entry(next_line.result()).model_dump(mode="json"))
+                next_line = None
+    except WebSocketDisconnect:
+        pass
+    finally:
+        unsubscribe()
+        closed.cancel()
+        if next_line is not None:
+            next_line.cancel()
+
+@app.get("/shards")
+def shard_metrics():
+    if not coordinator:
+        return {"enabled": False}
+    return {"enabled": True, **coordinator.metrics()}
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
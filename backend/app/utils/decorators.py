@@ -15,14 +15,16 @@ def with_retry(retries=3):
     return decorator
 
 def with_logging(func):
+    # Module logger and lazy %-formatting: nothing is formatted unless a handler wants it
+    logger = logging.getLogger(func.__module__)
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        logging.info(f"Executing {func.__name__}")
+        logger.info("Executing %s", func.__name__)
         try:
             result = func(*args, **kwargs)
-            logging.info(f"Finished {func.__name__}")
+            logger.info("Finished %s", func.__name__)
             return result
         except Exception as e:
-            logging.error(f"Error in {func.__name__}: {e}")
+            logger.error("Error in %s: %s", func.__name__, e)
             raise e
     return wrapper
@@ -0,0 +1,108 @@
+"""
+Worker process for the durable local task queue.
+
+    python -m app.worker --queue pytaskflow_queue.db --batch-size 10 --concurrency 4
+
+Leases tasks in batches, executes them and reports all results of a batch in one
+transaction. Run as many workers as the machine (or the queue lag) calls for.
+"""
+import argparse
+import logging
+import os
+import pickle
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, List, Tuple
+
+from app.core.queue_backend import DurableTaskQueue
+from app.core.logs import TaskLogging, bind_task, log_name
+
+logger = logging.getLogger(__name__)
+
+
+def _run_one(payload: bytes) -> Tuple[bool, Any]:
+    try:
+        task, context = pickle.loads(payload)
+        if context is None:
+            from app.core.task import TaskContext
+            context = TaskContext(workflow_id="worker", run_id=f"run_{int(time.time())}")
+        with bind_task(context.workflow_id, log_name(task)):
+            return True, task.execute(context)
+    except Exception as e:
+        return False, f"{type(e).__name__}: {e}"
+
+
+class QueueWorker:
+    def __init__(self, queue: DurableTaskQueue, batch_size: int = 10, concurrency: int = 4,
+                 visibility_timeout: float = 60.0, idle_sleep: float = 0.2):
+        self.queue = queue
+        self.batch_size = batch_size
+        self.visibility_timeout = visibility_timeout
+        self.idle_sleep = idle_sleep
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._stop = threading.Event()
+
+    def run_once(self) -> int:
+        """Leases, executes and reports one batch. Returns the number of tasks processed."""
+        leased = self.queue.lease(self.worker_id, self.batch_size, self.visibility_timeout)
+        if not leased:
+            return 0
+        ids = [task_id for task_id, _ in leased]
+        futures = [self.executor.submit(_run_one, payload) for _, payload in leased]
+        # Keep leases alive while the batch is still running
+        while not self._stop.is_set():
+            _, running = wait(futures, timeout=self.visibility_timeout / 3)
+            if not running:
+                break
+            self.queue.heartbeat(self.worker_id, ids, self.visibility_timeout)
+        # Stopping: no more heartbeats, just let the batch finish and report it
+        wait(futures)
+        outcomes: List[Tuple[str, bool, Any]] = []
+        for task_id, future in zip(ids, futures):
+            ok, value = future.result()
+            try:
+                pickle.dumps(value)
+            except Exception:
+                value = repr(value)
+            outcomes.append((task_id, ok, value))
+        self.queue.complete(self.worker_id, outcomes)
+        return len(outcomes)
+
+    def run_forever(self):
+        logger.info("Worker %s polling %s", self.worker_id, self.queue.path)
+        while not self._stop.is_set():
+            if not self.run_once():
+                self._stop.wait(self.idle_sleep)
+
+    def stop(self):
+        self._stop.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PyTaskFlow queue worker")
+    parser.add_argument("--queue", default=os.environ.get("PYTASKFLOW_QUEUE", "pytaskflow_queue.db"))
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--visibility-timeout", type=float, default=60.0)
+    parser.add_argument("--log-dir", default=os.environ.get("PYTASKFLOW_LOG_DIR"),
+                        help="Write task logs to a rotated tasks.log here (background writer)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    task_logging = TaskLogging(log_dir=args.log_dir)
+    if args.log_dir:
+        task_logging.start()
+    worker = QueueWorker(DurableTaskQueue(args.queue), args.batch_size, args.concurrency, args.visibility_timeout)
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        worker.stop()
+    finally:
+        task_logging.stop()
+
+
+if __name__ == "__main__":
+    main()
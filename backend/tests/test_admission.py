@@ -0,0 +1,51 @@
+import asyncio
+import os
+import sys
+
+# Ensure backend path is in sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.core.admission import AdmissionController, AdmissionTicket, AdmissionRejected
+
+def make_run(gate: asyncio.Event, started: list, name: str):
+    async def run():
+        started.append(name)
+        await gate.wait()
+    return run
+
+async def test_quotas_and_backpressure():
+    print("\n--- Test: Owner/Tag Quotas and Bounded Queue ---")
+    ctl = AdmissionController(max_concurrent_runs=3, max_queue_depth=2, owner_quota=2, tag_quotas={"backfill": 1})
+    gate = asyncio.Event()
+    started = []
+
+    ctl.submit(AdmissionTicket("a1", "team-a"), make_run(gate, started, "a1"))
+    ctl.submit(AdmissionTicket("a2", "team-a"), make_run(gate, started, "a2"))
+    # Over team-a's quota: parked, but must not block team-b behind it
+    ctl.submit(AdmissionTicket("a3", "team-a"), make_run(gate, started, "a3"))
+    ctl.submit(AdmissionTicket("b1", "team-b", ["backfill"]), make_run(gate, started, "b1"))
+    # Over the backfill tag quota and the global limit
+    ctl.submit(AdmissionTicket("b2", "team-b", ["backfill"]), make_run(gate, started, "b2"))
+    await asyncio.sleep(0)
+
+    assert sorted(started) == ["a1", "a2", "b1"], started
+    metrics = ctl.metrics()
+    assert metrics["running"] == 3 and metrics["queue_depth"] == 2
+    assert metrics["running_by_owner"] == {"team-a": 2, "team-b": 1}
+
+    try:
+        ctl.submit(AdmissionTicket("c1", "team-c"), make_run(gate, started, "c1"))
+        assert False, "queue should be full"
+    except AdmissionRejected as e:
+        assert e.retry_after >= 1
+    assert ctl.metrics()["rejected_total"] == 1
+
+    gate.set()
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert sorted(started) == ["a1", "a2", "a3", "b1", "b2"], started
+    assert ctl.metrics()["running"] == 0
+    print(">>> SUCCESS: Quotas enforced, excess queued, overflow rejected")
+
+if __name__ == "__main__":
+    asyncio.run(test_quotas_and_backpressure())
@@ -0,0 +1,77 @@
+import os
+import sys
+import threading
+
+# Ensure backend path is in sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.core.autoscaling import ScalingPolicy
+from app.core.backend import LocalExecutionBackend
+from app.core.task import PythonFunctionTask
+
+class ResizeRecorder:
+    def __init__(self):
+        self.events = []
+    def update(self, event: str, data: any):
+        self.events.append((event, data))
+
+def test_pool_grows_under_backlog_and_shrinks_when_idle():
+    print("\n--- Test: Queue-Lag Driven Pool Autoscaling ---")
+    policy = ScalingPolicy(min_workers=2, max_workers=8, cooldown_up=5, cooldown_down=30,
+                           interval=3600, utilization_window=3)
+    backend = LocalExecutionBackend(scaling=policy)
+    recorder = ResizeRecorder()
+    backend.attach(recorder)
+    scaler = backend.autoscaler
+    assert backend.pool_size == 2
+
+    gate = threading.Event()
+    futures = [backend.submit_task(PythonFunctionTask(f"t{i}", lambda c, p: gate.wait())) for i in range(40)]
+    # 38 pending / 2 workers > 5 tasks per worker: grow
+    assert scaler.tick(now=100) == 4
+    assert backend.pool_size == 4 and backend.metrics()["running"] == 4
+    # Cooldown holds the size
+    assert scaler.tick(now=102) is None
+    assert scaler.tick(now=105) == 8
+    # Capped at max_workers
+    assert scaler.tick(now=111) is None and backend.pool_size == 8
+
+    gate.set()
+    for f in futures:
+        f.result(timeout=5)
+    # Idle, but shrink needs a full utilization window and the down cooldown
+    assert scaler.tick(now=112) is None
+    assert scaler.tick(now=113) is None
+    assert scaler.tick(now=114) is None
+    assert scaler.tick(now=136) == 6
+    for now in (137, 138):
+        scaler.tick(now=now)
+    assert backend.pool_size == 6
+
+    assert [e for e, _ in recorder.events] == ["pool_resized"] * 3
+    assert [d["to"] for _, d in recorder.events] == [4, 8, 6]
+    assert [r["to"] for r in backend.metrics()["resizes"]] == [4, 8, 6]
+    scaler.stop()
+    print(">>> SUCCESS: Pool grew during the burst and shrank when quiet")
+
+def test_metrics_with_empty_pool():
+    print("\n--- Test: Metrics With a Pool Scaled to Zero ---")
+    backend = LocalExecutionBackend(scaling=ScalingPolicy(min_workers=0, max_workers=4, interval=3600,
+                                                          cooldown_down=30, utilization_window=2))
+    assert backend.pool_size == 0
+    future = backend.submit_task(PythonFunctionTask("waiting", lambda c, p: None))
+    metrics = backend.metrics()
+    assert metrics["pending"] == 1 and metrics["tasks_per_worker"] == 1 and metrics["utilization"] == 0
+    # Backlog on an empty pool scales it up
+    assert backend.autoscaler.tick(now=100) == 1
+    future.result(timeout=5)
+    # Idle again: back down to zero, and an idle empty pool stays empty
+    assert backend.autoscaler.tick(now=101) is None
+    assert backend.autoscaler.tick(now=131) == 0 and backend.pool_size == 0
+    assert backend.autoscaler.tick(now=200) is None and backend.pool_size == 0
+    backend.autoscaler.stop()
+    print(">>> SUCCESS: Metrics reported without dividing by an empty pool")
+
+if __name__ == "__main__":
+    test_pool_grows_under_backlog_and_shrinks_when_idle()
+    test_metrics_with_empty_pool()
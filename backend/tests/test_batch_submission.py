@@ -0,0 +1,85 @@
+import os
+import sys
+import tempfile
+
+# Ensure backend path is in sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+# No run is ever admitted, so everything stays queued and the queue fills after three
+tmp = tempfile.TemporaryDirectory()
+os.environ.update({"PYTASKFLOW_JOURNAL": os.path.join(tmp.name, "journal.db"),
+                   "PYTASKFLOW_MAX_RUNS": "0", "PYTASKFLOW_ADMISSION_QUEUE": "3"})
+
+from fastapi.testclient import TestClient
+from app import main
+
+def definition(wf_id, **extra):
+    return {"id": wf_id, "name": wf_id, "description": "", "version": "1", "owner": "team-a",
+            "tasks": [{"name": "Extract", "type": "python"}], **extra}
+
+def test_batch_submission():
+    print("\n--- Test: Batch Submission ---")
+    compiled = []
+    new_execution = main.new_execution
+    def recording(c, *args, **kwargs):
+        compiled.append(c.request)
+        return new_execution(c, *args, **kwargs)
+    main.new_execution = recording
+
+    with TestClient(main.app) as client:
+        # A definitions-only batch registers them
+        r = client.post("/workflows/batch", json={"definitions": [definition("stored", priority=5, incremental=True)],
+                                                  "executions": []})
+        assert r.status_code == 200 and r.json()["executionIds"] == []
+
+        # New and stored definitions mixed; the stored one keeps its priority and incremental flag
+        r = client.post("/workflows/batch", json={
+            "definitions": [definition("fresh")],
+            "executions": [{"workflowId": "fresh"}, {"workflowId": "stored", "params": {"day": 1}}],
+        })
+        assert r.status_code == 200, r.text
+        ids = r.json()["executionIds"]
+        assert [i.rpartition("-")[0] for i in ids] == ["fresh", "stored"]
+        assert [(c.id, c.priority, c.incremental) for c in compiled] == [("fresh", 0, False), ("stored", 5, True)]
+        assert main.db.get_workflow("fresh") and main.db.executions[ids[1]].params == {"day": 1}
+
+        # One unknown reference rejects the whole batch and registers nothing
+        queued = main.admission.metrics()["queue_depth"]
+        r = client.post("/workflows/batch", json={
+            "definitions": [definition("ghost")],
+            "executions": [{"workflowId": "ghost"}, {"workflowId": "missing"}],
+        })
+        assert r.status_code == 404 and "missing" in r.json()["detail"]
+        assert main.db.get_workflow("ghost") is None
+        assert main.admission.metrics()["queue_depth"] == queued and len(main.db.executions) == 2
+
+        # A definition whose tasks cannot be built is a 422 before any execution of the batch is admitted
+        bad = definition("bad")
+        bad["tasks"] = [{"name": "Load", "type": "map", "params": {}}]
+        r = client.post("/workflows/batch", json={
+            "definitions": [definition("ok"), bad],
+            "executions": [{"workflowId": "ok"}, {"workflowId": "bad"}],
+        })
+        assert r.status_code == 422 and "Load" in r.json()["detail"]
+        assert client.post("/workflows", json=bad).status_code == 422
+        assert main.db.get_workflow("ok") is None and main.db.get_workflow("bad") is None
+        assert main.admission.metrics()["queue_depth"] == queued and len(main.db.executions) == 2
+
+        # The queue fills part-way: the rest is counted as rejected
+        r = client.post("/workflows/batch", json={"executions": [{"workflowId": "stored"}, {"workflowId": "stored"}]})
+        assert r.status_code == 200 and len(r.json()["executionIds"]) == 1 and r.json()["rejected"] == 1
+
+        # Nothing admitted at all: 429 with Retry-After, and the definition is not registered
+        r = client.post("/workflows/batch", json={"definitions": [definition("late")],
+                                                  "executions": [{"workflowId": "late"}]})
+        assert r.status_code == 429 and int(r.headers["Retry-After"]) >= 1
+        assert main.db.get_workflow("late") is None and len(main.db.executions) == 3
+    main.new_execution = new_execution
+    print(">>> SUCCESS: Batches are validated and admitted before anything is registered")
+
+if __name__ == "__main__":
+    try:
+        test_batch_submission()
+    finally:
+        main.journal.close()
+        tmp.cleanup()
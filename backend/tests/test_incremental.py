@@ -0,0 +1,116 @@
+import asyncio
+import os
+import sys
+import tempfile
+
+# Ensure backend path is in sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.core.engine import AdvancedWorkflowEngine
+from app.core.backend import LocalExecutionBackend
+from app.core.task import PythonFunctionTask
+from app.core.dag import SimpleWorkflowDAG
+from app.core.journal import RunJournal
+from app.core.incremental import plan_incremental
+
+def definition(scale):
+    # Shape of WorkflowCreateRequest.model_dump(): Extract -> Transform -> Load, Extract -> Audit
+    return {
+        "id": "etl",
+        "tasks": [
+            {"name": "Extract", "type": "python", "params": {}, "dependencies": []},
+            {"name": "Transform", "type": "python", "params": {"scale": scale}, "dependencies": ["Extract"]},
+            {"name": "Load", "type": "python", "params": {}, "dependencies": ["Transform"]},
+            {"name": "Audit", "type": "python", "params": {}, "dependencies": ["Extract"]},
+        ],
+    }
+
+def build_dag(execution_id, request, calls):
+    def extract(c, p):
+        calls.append("Extract")
+        return [1, 2, 3]
+
+    def transform(c, p):
+        calls.append("Transform")
+        return [x * p["scale"] for x in c.task_results["Extract"].get()]
+
+    def load(c, p):
+        calls.append("Load")
+        return sum(c.task_results["Transform"].get())
+
+    def audit(c, p):
+        calls.append("Audit")
+        return len(c.task_results["Extract"].get())
+
+    actions = {"Extract": extract, "Transform": transform, "Load": load, "Audit": audit}
+    dag = SimpleWorkflowDAG(execution_id)
+    dag.metadata = {"request": request, "params": {}}
+    for config in request["tasks"]:
+        dag.add_task(PythonFunctionTask(config["name"], actions[config["name"]], config["params"]))
+    for config in request["tasks"]:
+        for dep in config["dependencies"]:
+            dag.add_dependency(dag.tasks[dep], dag.tasks[config["name"]])
+    return dag
+
+async def test_incremental_rerun():
+    print("\n--- Test: Incremental Re-run ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = RunJournal(os.path.join(tmp, "journal.db"))
+        engine = AdvancedWorkflowEngine(LocalExecutionBackend(max_workers=2), journal=journal)
+
+        calls = []
+        await engine.run(build_dag("etl-00000001", definition(2), calls))
+        assert sorted(calls) == ["Audit", "Extract", "Load", "Transform"]
+
+        # Change one task's params: only it and its downstream closure run again
+        request = definition(10)
+        dag = build_dag("etl-00000002", request, calls)
+        baseline = journal.last_successful_run("etl")
+        assert baseline.run_id == "etl-00000001"
+        dag.reuse = plan_incremental(dag, request, {}, baseline)
+        assert sorted(dag.reuse) == ["Audit", "Extract"]
+
+        calls.clear()
+        result = await engine.run(dag)
+        assert sorted(calls) == ["Load", "Transform"]
+        assert result.results["Load"] == 60
+        assert result.results["Audit"] == 3
+
+        # The incremental run is itself a complete baseline: nothing changed, nothing runs
+        baseline = journal.last_successful_run("etl")
+        assert baseline.run_id == "etl-00000002"
+        assert set(baseline.completed) == {"Extract", "Transform", "Load", "Audit"}
+        dag = build_dag("etl-00000003", request, calls)
+        dag.reuse = plan_incremental(dag, request, {}, baseline)
+        calls.clear()
+        result = await engine.run(dag)
+        assert calls == []
+        assert result.results["Load"] == 60
+
+        # Different run params invalidate everything
+        assert plan_incremental(dag, request, {"date": "2024-01-01"}, baseline) == {}
+
+        # A failed run never becomes the baseline; another workflow sharing the id prefix is separate
+        journal.run_started("etl-00000004")
+        journal.task_failed("etl-00000004", "Load", "boom")
+        journal.run_finished("etl-00000004")
+        journal.run_started("etl-x-00000005")
+        journal.run_finished("etl-x-00000005", succeeded=True)
+        assert journal.last_successful_run("etl").run_id == "etl-00000003"
+        assert journal.last_successful_run("etl-x").run_id == "etl-x-00000005"
+        plan = journal._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT run_id FROM last_success WHERE workflow_key = ?", ("etl",)
+        ).fetchall()
+        assert "USING INDEX" in str(plan) and "SCAN" not in str(plan)
+
+        # Journals from before the last_success table are backfilled on open
+        journal._conn.execute("DROP TABLE last_success")
+        journal.close()
+        journal = RunJournal(os.path.join(tmp, "journal.db"))
+        assert journal.last_successful_run("etl").run_id == "etl-00000003"
+        assert journal.last_successful_run("etl-x").run_id == "etl-x-00000005"
+        journal.close()
+    print(">>> SUCCESS: Only changed tasks and their dependents re-ran")
+
+if __name__ == "__main__":
+    asyncio.run(test_incremental_rerun())
@@ -0,0 +1,76 @@
+import asyncio
+import os
+import sys
+import tempfile
+
+# Ensure backend path is in sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.core.engine import AdvancedWorkflowEngine
+from app.core.backend import LocalExecutionBackend
+from app.core.task import PythonFunctionTask
+from app.core.extensions import BranchPythonTask
+from app.core.dag import SimpleWorkflowDAG
+from app.core.journal import RunJournal
+from app.interfaces import TaskStatus
+
+def build_dag(calls):
+    def track(name, value):
+        def action(c, p):
+            calls.append(name)
+            return value
+        return action
+
+    dag = SimpleWorkflowDAG("journal_wf")
+    t_extract = PythonFunctionTask("Extract", track("Extract", "rows"))
+    t_branch = BranchPythonTask("Decide", track("Decide", ["Load"]))
+    t_load = PythonFunctionTask("Load", track("Load", "loaded"))
+    t_alt = PythonFunctionTask("Alt", track("Alt", "alt"))
+    dag.add_dependency(t_extract, t_branch)
+    dag.add_dependency(t_branch, t_load)
+    dag.add_dependency(t_branch, t_alt)
+    return dag
+
+async def test_resume_from_frontier():
+    print("\n--- Test: Resume From Journal Frontier ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = RunJournal(os.path.join(tmp, "journal.db"))
+        # Simulate a crash after Extract and the branch decision were journaled
+        journal.run_started("journal_wf", {"request": {"id": "journal_wf"}})
+        journal.task_completed("journal_wf", "Extract", "rows")
+        journal.task_completed("journal_wf", "Decide", ["Load"])
+        journal.task_skipped("journal_wf", "Alt")
+
+        assert "journal_wf" in journal.unfinished_runs()
+
+        calls = []
+        engine = AdvancedWorkflowEngine(LocalExecutionBackend(max_workers=2), journal=journal)
+        result = await engine.run(build_dag(calls))
+
+        assert result.status == TaskStatus.COMPLETED
+        assert calls == ["Load"], calls
+        assert result.results["Extract"] == "rows"
+        assert result.results["Load"] == "loaded"
+        assert result.results["Alt"] is None
+        assert journal.unfinished_runs() == {}
+        journal.close()
+    print(">>> SUCCESS: Only the unfinished frontier was executed")
+
+async def test_journal_records_run():
+    print("\n--- Test: Journal Records Completions ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = RunJournal(os.path.join(tmp, "journal.db"))
+        calls = []
+        engine = AdvancedWorkflowEngine(LocalExecutionBackend(max_workers=2), journal=journal)
+        await engine.run(build_dag(calls))
+
+        replayed = journal.replay("journal_wf")
+        assert replayed.started and replayed.finished
+        assert replayed.completed == {"Extract": "rows", "Decide": ["Load"], "Load": "loaded"}
+        assert replayed.skipped == {"Alt"}
+        journal.close()
+    print(">>> SUCCESS: Completions and branch decisions journaled")
+
+if __name__ == "__main__":
+    asyncio.run(test_resume_from_frontier())
+    asyncio.run(test_journal_records_run())
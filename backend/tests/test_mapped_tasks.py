@@ -0,0 +1,127 @@
+import asyncio
+import os
+import sys
+import threading
+
+# Ensure backend path is in sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.core.engine import AdvancedWorkflowEngine
+from app.core.backend import LocalExecutionBackend
+from app.core.task import PythonFunctionTask
+from app.core.extensions import MappedTask
+from app.core.dag import SimpleWorkflowDAG
+from app.utils.registry import TaskRegistryMeta
+from app.interfaces import TaskStatus
+from app.api.models import TaskConfig
+from pydantic import ValidationError
+
+class EventRecorder:
+    def __init__(self):
+        self.events = []
+    def update(self, event: str, data: any):
+        self.events.append((event, data))
+
+async def test_lazy_chunked_fan_out():
+    print("\n--- Test: Dynamic Task Mapping ---")
+    assert TaskRegistryMeta.get_task_class("mapped_task") is MappedTask
+
+    lock = threading.Lock()
+    in_flight = [0, 0]  # current, peak
+
+    def square_chunk(ctx, params, chunk):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        try:
+            return [x * x for x in chunk]
+        finally:
+            with lock:
+                in_flight[0] -= 1
+
+    def total(ctx, params, chunk_results):
+        return sum(sum(c) for c in chunk_results)
+
+    backend = LocalExecutionBackend(max_workers=8)
+    engine = AdvancedWorkflowEngine(backend)
+    dag = SimpleWorkflowDAG("map_wf")
+    list_files = PythonFunctionTask("ListItems", lambda c, p: list(range(1000)))
+    mapped = MappedTask("Square", square_chunk, {"upstream": "ListItems", "chunk_size": 7, "parallelism": 3}, reduce=total)
+    report = PythonFunctionTask("Report", lambda c, p: "reported")
+    dag.add_dependency(list_files, mapped)
+    dag.add_dependency(mapped, report)
+
+    result = await engine.run(dag)
+
+    assert result.results["Square"] == sum(x * x for x in range(1000))
+    assert result.results["Report"] == "reported"
+    assert in_flight[1] <= 3, in_flight
+    print(">>> SUCCESS: 1000 items in 143 chunks, never more than 3 in flight")
+
+def test_expansion_is_lazy():
+    print("\n--- Test: Lazy Expansion ---")
+    mapped = MappedTask("Lazy", lambda c, p, chunk: chunk, {"upstream": "Up", "chunk_size": 1000})
+    instances = mapped.expand(iter(range(10 ** 9)))
+    first = next(instances)
+    assert first.name == "Lazy[0]" and first.chunk == list(range(1000))
+    assert next(instances).index == 1
+    print(">>> SUCCESS: Instances are created on demand")
+
+async def test_slots_and_bad_input():
+    print("\n--- Test: Mapped Instances Use Task Slots; Bad Input Fails ---")
+    lock = threading.Lock()
+    in_flight = [0, 0]  # current, peak
+
+    def slow_chunk(ctx, params, chunk):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        try:
+            threading.Event().wait(0.01)
+            return chunk
+        finally:
+            with lock:
+                in_flight[0] -= 1
+
+    # parallelism 8, but only 2 active tasks engine-wide
+    engine = AdvancedWorkflowEngine(LocalExecutionBackend(max_workers=8), max_active_tasks=2)
+    recorder = EventRecorder()
+    engine.attach(recorder)
+    dag = SimpleWorkflowDAG("map_slots_wf")
+    dag.add_dependency(PythonFunctionTask("Items", lambda c, p: list(range(40))),
+                       MappedTask("Wide", slow_chunk, {"upstream": "Items", "parallelism": 8}))
+    result = await asyncio.wait_for(engine.run(dag), timeout=10)
+    assert result.results["Wide"] == [[i] for i in range(40)]
+    assert in_flight[1] <= 2, in_flight
+
+    # A non-list upstream result, or an upstream that is not a parent, fails the map
+    dag = SimpleWorkflowDAG("map_bad_wf")
+    dag.add_dependency(PythonFunctionTask("Count", lambda c, p: 5),
+                       MappedTask("NotAList", slow_chunk, {"upstream": "Count"}))
+    dag.add_dependency(PythonFunctionTask("Other", lambda c, p: [1]),
+                       MappedTask("Orphan", slow_chunk, {"upstream": "Missing"}))
+    # Src has already finished when Skip runs, but it is a grandparent, not a parent
+    src, mid = PythonFunctionTask("Src", lambda c, p: [1, 2, 3]), PythonFunctionTask("Mid", lambda c, p: [4])
+    dag.add_dependency(src, mid)
+    dag.add_dependency(mid, MappedTask("Skip", slow_chunk, {"upstream": "Src"}))
+    result = await asyncio.wait_for(engine.run(dag), timeout=10)
+    assert result.status == TaskStatus.FAILED
+    errors = {d["task"]: d["error"] for e, d in recorder.events if e == "task_failed"}
+    assert "expects a list from 'Count', got int" in errors["NotAList"]
+    assert "'Missing' is not one of its parents" in errors["Orphan"]
+    assert "'Src' is not one of its parents" in errors["Skip"]
+
+    # The API rejects non-numeric or non-positive sizes (422) before a task is ever built
+    assert TaskConfig(name="Wide", type="map", params={"upstream": "Items", "chunk_size": "4", "parallelism": 2})
+    for params in ({"chunk_size": "ten"}, {"parallelism": 0}, {"chunk_size": 2.5}):
+        try:
+            TaskConfig(name="Wide", type="map", params={"upstream": "Items", **params})
+            assert False, f"{params} should be rejected"
+        except ValidationError as e:
+            assert "must be a positive integer" in str(e)
+    print(">>> SUCCESS: Instances held to max_active_tasks; bad map input failed clearly")
+
+if __name__ == "__main__":
+    asyncio.run(test_lazy_chunked_fan_out())
+    test_expansion_is_lazy()
+    asyncio.run(test_slots_and_bad_input())
@@ -0,0 +1,80 @@
+import asyncio
+import os
+import sys
+
+# Ensure backend path is in sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.core.engine import AdvancedWorkflowEngine
+from app.core.backend import LocalExecutionBackend
+from app.core.task import PythonFunctionTask
+from app.core.dag import SimpleWorkflowDAG
+from app.interfaces import TaskStatus
+
+class EventRecorder:
+    def __init__(self):
+        self.events = []
+    def update(self, event: str, data: any):
+        self.events.append((event, data))
+
+def boom(c, p):
+    raise RuntimeError("tiny failure")
+
+async def test_cheap_tasks_are_batched():
+    print("\n--- Test: Micro-Batching Cheap Tasks ---")
+    backend = LocalExecutionBackend(max_workers=2)
+    engine = AdvancedWorkflowEngine(backend, batch_size=50)
+    recorder = EventRecorder()
+    engine.attach(recorder)
+
+    dag = SimpleWorkflowDAG("batch_wf")
+    root = PythonFunctionTask("Root", lambda c, p: "root")
+    join = PythonFunctionTask("Join", lambda c, p: "joined")
+    dag.add_task(root)
+    for i in range(100):
+        tiny = PythonFunctionTask(f"Tiny_{i}", lambda c, p: p["i"] + 1, {"i": i, "cheap": True})
+        dag.add_dependency(root, tiny)
+        dag.add_dependency(tiny, join)
+    dag.add_dependency(root, PythonFunctionTask("Broken", boom, {"cheap": True}))
+
+    result = await engine.run(dag)
+
+    # The failed task fails the run, but only itself: its siblings and Join still ran
+    assert result.status == TaskStatus.FAILED
+    assert all(result.results[f"Tiny_{i}"] == i + 1 for i in range(100))
+    assert result.results["Join"] == "joined"
+    batches = [d for e, d in recorder.events if e == "task_batch_completed"]
+    # 101 cheap tasks in batches of at most 50: 3 submissions instead of 101
+    assert len(batches) == 3, len(batches)
+    assert sum(len(b["tasks"]) for b in batches) == 100
+    assert [d["task"] for e, d in recorder.events if e == "task_failed"] == ["Broken"]
+    # Non-cheap tasks still report individually
+    assert [d["task"] for e, d in recorder.events if e == "task_completed"] == ["Root", "Join"]
+    print(">>> SUCCESS: 101 cheap tasks ran as 3 batches, failure isolated")
+
+async def test_batch_members_hold_task_slots():
+    print("\n--- Test: Batch Members Count Against max_active_tasks ---")
+    backend = LocalExecutionBackend(max_workers=2)
+    sizes = []
+    submit_batch = backend.submit_batch
+    def recording_submit(tasks, *args, **kwargs):
+        sizes.append(len(tasks))
+        return submit_batch(tasks, *args, **kwargs)
+    backend.submit_batch = recording_submit
+
+    engine = AdvancedWorkflowEngine(backend, batch_size=50, max_active_tasks=4)
+    dag = SimpleWorkflowDAG("batch_slots_wf")
+    for i in range(40):
+        dag.add_task(PythonFunctionTask(f"Tiny_{i}", lambda c, p: p["i"], {"i": i, "cheap": True}))
+    result = await engine.run(dag)
+
+    assert result.status == TaskStatus.COMPLETED
+    assert sorted(result.results.values()) == list(range(40))
+    # Never more cheap tasks in flight than slots, even though batch_size is 50
+    assert max(sizes) <= 4 and sum(sizes) == 40, sizes
+    assert engine.active_tasks == 0
+    print(">>> SUCCESS: Batches capped by free task slots")
+
+if __name__ == "__main__":
+    asyncio.run(test_cheap_tasks_are_batched())
+    asyncio.run(test_batch_members_hold_task_slots())
@@ -0,0 +1,110 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# Ensure backend path is in sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.core.engine import AdvancedWorkflowEngine
+from app.core.backend import LocalExecutionBackend
+from app.core.task import PythonFunctionTask
+from app.core.dag import SimpleWorkflowDAG
+from app.core.cache import ResultCache
+
+class EventRecorder:
+    def __init__(self):
+        self.events = []
+    def update(self, event: str, data: any):
+        self.events.append((event, data.get("task") if isinstance(data, dict) else None))
+
+def build_dag(calls, threshold):
+    def extract(c, p):
+        calls.append("Extract")
+        return list(range(10))
+
+    def transform(c, p):
+        calls.append("Transform")
+        return [x for x in range(10) if x > p["threshold"]]
+
+    dag = SimpleWorkflowDAG("cache_wf")
+    t_extract = PythonFunctionTask("Extract", extract)
+    t_transform = PythonFunctionTask("Transform", transform, {"threshold": threshold})
+    dag.add_dependency(t_extract, t_transform)
+    return dag
+
+async def test_rerun_skips_unchanged_tasks():
+    print("\n--- Test: Content-Addressed Result Cache ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(disk_dir=tmp)
+        engine = AdvancedWorkflowEngine(LocalExecutionBackend(max_workers=2), cache=cache)
+        recorder = EventRecorder()
+        engine.attach(recorder)
+
+        calls = []
+        first = await engine.run(build_dag(calls, threshold=5))
+        assert calls == ["Extract", "Transform"]
+
+        calls.clear()
+        second = await engine.run(build_dag(calls, threshold=5))
+        assert calls == []
+        assert second.results == first.results
+        assert ("task_cached", "Transform") in recorder.events
+
+        # Changed params only invalidate the changed task
+        calls.clear()
+        third = await engine.run(build_dag(calls, threshold=7))
+        assert calls == ["Transform"]
+        assert third.results["Transform"] == [8, 9]
+
+        # A fresh cache on the same directory hits the mmap'd disk tier
+        cold = ResultCache(disk_dir=tmp)
+        engine = AdvancedWorkflowEngine(LocalExecutionBackend(max_workers=2), cache=cold)
+        calls.clear()
+        await engine.run(build_dag(calls, threshold=5))
+        assert calls == []
+        assert cold.metrics()["disk_hits"] == 2
+    print(">>> SUCCESS: Unchanged tasks served from cache, changed ones rerun")
+
+def test_memory_bound_and_ttl():
+    print("\n--- Test: LRU Bound and TTL ---")
+    cache = ResultCache(memory_bytes=2000, ttl=0.05)
+    for i in range(10):
+        cache.put(f"k{i}", b"x" * 500)
+    metrics = cache.metrics()
+    assert metrics["memory_bytes"] <= 2000 and metrics["evictions"] > 0
+    assert cache.get("k0") == (False, None)
+    assert cache.get("k9")[0]
+    time.sleep(0.06)
+    assert cache.get("k9") == (False, None)
+    print(">>> SUCCESS: Memory tier bounded by size, entries expire")
+
+async def test_key_covers_run_params_and_code():
+    print("\n--- Test: Cache Key Covers Run Params and Action Code ---")
+    engine = AdvancedWorkflowEngine(LocalExecutionBackend(max_workers=2), cache=ResultCache())
+
+    def run_with(params):
+        dag = SimpleWorkflowDAG("params_wf")
+        dag.params = params
+        dag.add_task(PythonFunctionTask("Greet", lambda c, p: f"hello {c.global_params['who']}"))
+        return engine.run(dag)
+
+    # Same definition, different run-level params: no cross-talk
+    assert (await run_with({"who": "a"})).results["Greet"] == "hello a"
+    assert (await run_with({"who": "b"})).results["Greet"] == "hello b"
+
+    # Lambdas share a __qualname__; their code (and captured constants) tell them apart
+    key = ResultCache.key_for
+    first = PythonFunctionTask("T", lambda c, p: 1)
+    second = PythonFunctionTask("T", lambda c, p: 2)
+    assert key(first, {}) != key(second, {})
+    bound = [PythonFunctionTask("T", (lambda n: lambda c, p: n)(n)) for n in ("x", "y")]
+    assert key(bound[0], {}) != key(bound[1], {})
+    assert key(first, {}) == key(PythonFunctionTask("T", first.action), {})
+    print(">>> SUCCESS: Run params and action code are part of the key")
+
+if __name__ == "__main__":
+    asyncio.run(test_rerun_skips_unchanged_tasks())
+    test_memory_bound_and_ttl()
+    asyncio.run(test_key_covers_run_params_and_code())
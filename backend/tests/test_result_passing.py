@@ -0,0 +1,138 @@
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+
+# Ensure backend path is in sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.core.engine import AdvancedWorkflowEngine
+from app.core.backend import LocalExecutionBackend
+from app.core.task import PythonFunctionTask
+from app.core.dag import SimpleWorkflowDAG
+from app.core.results import ResultStore, ResultHandle, preview_text
+from app.core.journal import RunJournal
+from app.core.cache import ResultCache
+
+async def test_upstream_results_in_context():
+    print("\n--- Test: Upstream Results via TaskContext ---")
+    seen = {}
+
+    def extract(c, p):
+        return [1, 2, 3]
+
+    def config(c, p):
+        return {"factor": 10}
+
+    def transform(c, p):
+        seen["upstream"] = sorted(c.task_results)
+        factor = c.task_results["Config"].get()["factor"]
+        return [x * factor for x in c.task_results["Extract"].get()]
+
+    def load(c, p):
+        seen["load_upstream"] = sorted(c.task_results)
+        return sum(c.task_results["Transform"].get())
+
+    dag = SimpleWorkflowDAG("passing_wf")
+    t_extract = PythonFunctionTask("Extract", extract)
+    t_config = PythonFunctionTask("Config", config)
+    t_transform = PythonFunctionTask("Transform", transform)
+    t_load = PythonFunctionTask("Load", load)
+    dag.add_dependency(t_extract, t_transform)
+    dag.add_dependency(t_config, t_transform)
+    dag.add_dependency(t_transform, t_load)
+
+    engine = AdvancedWorkflowEngine(LocalExecutionBackend(max_workers=2))
+    result = await engine.run(dag)
+    # Each task only sees its own parents
+    assert seen["upstream"] == ["Config", "Extract"]
+    assert seen["load_upstream"] == ["Transform"]
+    assert result.results["Load"] == 60
+    print(">>> SUCCESS: Downstream tasks read parent outputs through handles")
+
+class Counted:
+    pickles = 0
+
+    def __init__(self, payload=b"y" * 1000):
+        self.payload = payload
+
+    def __reduce__(self):
+        Counted.pickles += 1
+        return (Counted, (self.payload,))
+
+async def test_large_results_spill():
+    print("\n--- Test: Spill-to-Disk for Large Results ---")
+    seen = {}
+
+    def produce_bytes(c, p):
+        return b"x" * 200_000
+
+    def produce_rows(c, p):
+        return list(range(50_000))
+
+    def consume(c, p):
+        blob = c.task_results["Bytes"]
+        rows = c.task_results["Rows"]
+        seen["spilled"] = (blob.spilled, rows.spilled)
+        data = blob.get()
+        # Bytes are served straight from the mapping, without a copy
+        seen["zero_copy"] = isinstance(data, memoryview)
+        return len(data) + sum(rows.get())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultStore(root=tmp, spill_threshold=64 * 1024)
+        dag = SimpleWorkflowDAG("spill_wf")
+        t_bytes = PythonFunctionTask("Bytes", produce_bytes)
+        t_rows = PythonFunctionTask("Rows", produce_rows)
+        t_consume = PythonFunctionTask("Consume", consume)
+        dag.add_dependency(t_bytes, t_consume)
+        dag.add_dependency(t_rows, t_consume)
+
+        # Spills are written from a worker thread, never on the event loop
+        writers = []
+        put = store.blobs.put
+        def recording_put(*args):
+            writers.append(threading.current_thread())
+            return put(*args)
+        store.blobs.put = recording_put
+
+        engine = AdvancedWorkflowEngine(LocalExecutionBackend(max_workers=2), result_store=store)
+        result = await engine.run(dag)
+        assert len(writers) == 2 and threading.main_thread() not in writers
+        assert seen["spilled"] == (True, True)
+        assert seen["zero_copy"]
+        assert result.results["Consume"] == 200_000 + sum(range(50_000))
+        # Spilled outputs come back as handles; small ones as plain values
+        assert isinstance(result.results["Bytes"], ResultHandle)
+        assert isinstance(result.results["Consume"], int)
+        assert store.metrics()["spilled_blobs"] == 2
+
+        store.release_run("spill_wf")
+        assert store.metrics()["spilled_blobs"] == 0
+        assert not [f for f in os.listdir(tmp) if f.endswith(".blob")]
+
+        # One pickle per result, shared by the size check, the spill, the journal and the cache
+        Counted.pickles = 0
+        journal = RunJournal(os.path.join(tmp, "journal.db"))
+        engine = AdvancedWorkflowEngine(LocalExecutionBackend(max_workers=2), journal=journal,
+                                        cache=ResultCache(), result_store=ResultStore(root=tmp, spill_threshold=64))
+        dag = SimpleWorkflowDAG("pickle_once_wf")
+        dag.add_task(PythonFunctionTask("Counted", lambda c, p: Counted()))
+        await engine.run(dag)
+        assert Counted.pickles == 1
+
+    # Previews of large results stringify only what they show
+    reprs = []
+    class Row:
+        def __repr__(self):
+            reprs.append(self)
+            return "Row()"
+    text = preview_text([Row() for _ in range(100_000)], 256)
+    assert len(text) <= 259 and len(reprs) <= 32
+    assert preview_text("z" * 1_000_000, 10) == "z" * 10 + "..."
+    print(">>> SUCCESS: Large results spilled and read back via mmap")
+
+if __name__ == "__main__":
+    asyncio.run(test_upstream_results_in_context())
+    asyncio.run(test_large_results_spill())
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# Ensure backend path is in sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.core.engine import AdvancedWorkflowEngine
+from app.core.backend import LocalExecutionBackend
+from app.core.task import PythonFunctionTask
+from app.core.extensions import BranchPythonTask
+from app.core.dag import SimpleWorkflowDAG
+from app.core.results import ResultHandle, ResultStore
+from app.interfaces import TaskStatus
+
+def build_dag(wf_id, pick):
+    # Same task names in every run; only the branch decision differs
+    dag = SimpleWorkflowDAG(wf_id)
+    decide = BranchPythonTask("Decide", lambda c, p: [pick])
+    for name in ("A", "B"):
+        dag.add_dependency(decide, PythonFunctionTask(name, lambda c, p, n=name: f"{n} {c.workflow_id}"))
+    return dag
+
+async def test_runs_are_isolated_and_released():
+    print("\n--- Test: Run-Scoped State ---")
+    engine = AdvancedWorkflowEngine(LocalExecutionBackend(max_workers=4), history_size=3)
+    first, second = await asyncio.gather(engine.run(build_dag("wf_a", "A")), engine.run(build_dag("wf_b", "B")))
+    # Concurrent runs with the same task names do not see each other's outcomes
+    assert first.results["A"] == "A wf_a" and first.results["B"] is None
+    assert second.results["B"] == "B wf_b" and second.results["A"] is None
+
+    metrics = engine.metrics()
+    assert metrics["live_runs"] == 0 and metrics["run_state_bytes"] == 0
+    summary = engine.recent_runs[-1]
+    assert summary.status == TaskStatus.COMPLETED
+    assert summary.task_counts == {"skipped": 1, "completed": 2}
+
+    for i in range(5):
+        await engine.run(build_dag(f"wf_{i}", "A"))
+    assert len(engine.recent_runs) == 3
+    print(">>> SUCCESS: Runs isolated, state released, history bounded")
+
+async def test_pause_and_resume():
+    print("\n--- Test: Pause / Resume ---")
+    engine = AdvancedWorkflowEngine(LocalExecutionBackend(max_workers=2))
+    started = {}
+
+    def slow(c, p):
+        time.sleep(0.2)
+        return "slow"
+
+    def record(c, p):
+        started["Next"] = time.time()
+        return "next"
+
+    dag = SimpleWorkflowDAG("pause_wf")
+    dag.add_dependency(PythonFunctionTask("Slow", slow), PythonFunctionTask("Next", record))
+
+    run = asyncio.ensure_future(engine.run(dag))
+    await asyncio.sleep(0.05)
+    engine.pause("pause_wf")
+    assert engine.metrics()["paused_runs"] == 1
+    await asyncio.sleep(0.5)
+    # Slow finished while paused, but Next was not dispatched
+    assert "Next" not in started and not run.done()
+    resumed_at = time.time()
+    engine.resume("pause_wf")
+    result = await asyncio.wait_for(run, timeout=5)
+    assert result.results["Next"] == "next"
+    assert started["Next"] >= resumed_at
+    print(">>> SUCCESS: Paused run dispatched nothing until resumed")
+
+async def test_memory_budget_spills():
+    print("\n--- Test: Run-State Memory Budget ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultStore(root=tmp, spill_threshold=1024 * 1024)
+        engine = AdvancedWorkflowEngine(LocalExecutionBackend(max_workers=2), result_store=store,
+                                        memory_budget=300 * 1024)
+        dag = SimpleWorkflowDAG("budget_wf")
+        previous = None
+        for i in range(4):
+            # Each result is below the spill threshold, but together they exceed the budget
+            task = PythonFunctionTask(f"Chunk_{i}", lambda c, p: b"x" * (200 * 1024))
+            if previous:
+                dag.add_dependency(previous, task)
+            else:
+                dag.add_task(task)
+            previous = task
+        result = await engine.run(dag)
+        assert engine.spilled_under_pressure >= 3 * 200 * 1024
+        assert store.metrics()["spilled_blobs"] == 1  # identical payloads share one blob
+        assert bytes(result.results["Chunk_0"].get()) == b"x" * (200 * 1024)
+        store.release_run("budget_wf")
+
+        # String results (the common case) count too, even below the pickling early-out
+        engine = AdvancedWorkflowEngine(LocalExecutionBackend(max_workers=2), result_store=store,
+                                        memory_budget=300 * 1024)
+        dag = SimpleWorkflowDAG("budget_str_wf")
+        for i in range(4):
+            dag.add_task(PythonFunctionTask(f"Text_{i}", lambda c, p, i=i: str(i) * (200 * 1024)))
+        result = await engine.run(dag)
+        assert engine.spilled_under_pressure >= 2 * 200 * 1024
+        # Spilled strings come back behind their handle, unchanged
+        values = [r.get() if isinstance(r, ResultHandle) else r for r in result.results.values()]
+        assert sorted(values) == [str(i) * (200 * 1024) for i in range(4)]
+        store.release_run("budget_str_wf")
+    print(">>> SUCCESS: Results spilled to stay within the memory budget")
+
+if __name__ == "__main__":
+    asyncio.run(test_runs_are_isolated_and_released())
+    asyncio.run(test_pause_and_resume())
+    asyncio.run(test_memory_budget_spills())
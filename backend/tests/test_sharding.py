@@ -0,0 +1,101 @@
+import os
+import sys
+import tempfile
+import time
+
+# Ensure backend path is in sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.core.sharding import HashRing, ShardCoordinator
+
+def test_ring_moves_only_dead_nodes_keys():
+    print("\n--- Test: Consistent Hash Ring ---")
+    ring = HashRing(["node-a", "node-b", "node-c"])
+    keys = [f"wf-{i}" for i in range(3000)]
+    before = {k: ring.owner(k) for k in keys}
+    assert set(before.values()) == {"node-a", "node-b", "node-c"}
+
+    ring.remove("node-b")
+    after = {k: ring.owner(k) for k in keys}
+    moved = [k for k in keys if before[k] != after[k]]
+    assert all(before[k] == "node-b" for k in moved)
+    assert "node-b" not in after.values()
+    print(f">>> SUCCESS: Only node-b's {len(moved)} keys moved")
+
+def test_survivor_takes_over_dead_nodes_runs():
+    print("\n--- Test: Lease Takeover ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "shards.db")
+        a = ShardCoordinator(path, node_id="node-a", lease_ttl=0.2)
+        b = ShardCoordinator(path, node_id="node-b", lease_ttl=0.2)
+        a.heartbeat()
+        b.heartbeat()
+        a.heartbeat()
+
+        ids = [f"wf-{i}" for i in range(40)]
+        for execution_id in ids:
+            a.route(execution_id, {"request": {"id": execution_id}})
+
+        claimed_a = {e for e, _, _ in a.claim()}
+        claimed_b = {e for e, _, _ in b.claim()}
+        assert claimed_a and claimed_b
+        assert claimed_a.isdisjoint(claimed_b) and claimed_a | claimed_b == set(ids)
+        assert all(a.owner_of(e) == "node-a" for e in claimed_a)
+
+        # node-a dies (stops heartbeating); after its lease expires node-b takes over
+        a.finish(sorted(claimed_a)[0])
+        time.sleep(0.25)
+        b.heartbeat()
+        taken = b.claim()
+        assert {e for e, _, _ in taken} == claimed_a - {sorted(claimed_a)[0]}
+        assert all(taken_over for _, _, taken_over in taken)
+        assert b.metrics()["members"] == ["node-b"]
+
+        # Finished runs are deleted, and claims read only the claimant's shards through the index
+        for execution_id, _, _ in taken:
+            b.finish(execution_id)
+        metrics = b.metrics()
+        assert metrics["claimed"] == len(claimed_b) and metrics["pending"] == 0
+        plan = b._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT execution_id FROM inbox WHERE shard IN (1, 2) AND status = ?", ("pending",)
+        ).fetchall()
+        assert any("idx_inbox_shard_status" in row[-1] for row in plan), plan
+    print(">>> SUCCESS: Unfinished runs moved to the survivor")
+
+def test_api_keeps_records_on_the_owner():
+    print("\n--- Test: Execution Records Live on the Shard Owner ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update({"PYTASKFLOW_SHARDS_DB": os.path.join(tmp, "shards.db"),
+                           "PYTASKFLOW_JOURNAL": os.path.join(tmp, "journal.db")})
+        from fastapi.testclient import TestClient
+        from app import main
+
+        # Another live node owns part of the ring; it never runs anything in this test
+        other = ShardCoordinator(os.environ["PYTASKFLOW_SHARDS_DB"], node_id="node-other")
+        other.heartbeat()
+        request = {"id": "sharded", "name": "sharded", "description": "", "version": "1", "owner": "team-a",
+                   "tasks": [{"name": "Extract", "type": "python"}]}
+        with TestClient(main.app) as client:
+            ids = client.post("/workflows/batch", json={"definitions": [request],
+                                                        "executions": [{"workflowId": "sharded"}] * 20}).json()["executionIds"]
+            mine = {e for e in ids if main.coordinator.owner_of(e) == main.coordinator.node_id}
+            assert mine and len(mine) < len(ids)
+            # Only the executions this node claims get a record here, and they progress
+            for _ in range(100):
+                if set(main.db.executions) == mine and all(
+                        main.db.executions[e].status in ("completed", "failed") for e in mine):
+                    break
+                time.sleep(0.1)
+            assert set(main.db.executions) == mine
+            assert all(main.db.executions[e].status in ("completed", "failed") for e in mine)
+
+            theirs = next(e for e in ids if e not in mine)
+            r = client.get(f"/executions/{theirs}/tasks/Extract/logs")
+            assert r.status_code == 404 and "node-other" in r.json()["detail"]
+        main.journal.close()
+    print(f">>> SUCCESS: {len(mine)} of {len(ids)} execution records kept by their owner")
+
+if __name__ == "__main__":
+    test_ring_moves_only_dead_nodes_keys()
+    test_survivor_takes_over_dead_nodes_runs()
+    test_api_keeps_records_on_the_owner()
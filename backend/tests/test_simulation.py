@@ -0,0 +1,133 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# Ensure backend path is in sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.core.engine import AdvancedWorkflowEngine
+from app.core.task import PythonFunctionTask
+from app.core.extensions import BranchPythonTask
+from app.core.dag import SimpleWorkflowDAG
+from app.core.simulation import (HistoryModel, SimulationBackend, VirtualClockLoop, fixed, lognormal,
+                                 poisson_arrivals, simulate, sweep)
+
+def noop(c, p):
+    return None
+
+def etl_dag(i):
+    # Extract -> 3 transforms -> Load; a branch picks one of two reports
+    dag = SimpleWorkflowDAG(f"sim_{i}")
+    extract, load = PythonFunctionTask("Extract", noop), PythonFunctionTask("Load", noop)
+    for k in range(3):
+        transform = PythonFunctionTask(f"Transform_{k}", noop)
+        dag.add_dependency(extract, transform)
+        dag.add_dependency(transform, load)
+    decide = BranchPythonTask("Decide", lambda c, p: ["Full_Report"] if i % 2 else ["Summary"])
+    dag.add_dependency(load, decide)
+    dag.add_dependency(decide, PythonFunctionTask("Full_Report", noop))
+    dag.add_dependency(decide, PythonFunctionTask("Summary", noop))
+    return dag
+
+# simulate() drives its own virtual-clock loop, so these tests are plain functions
+def test_capacity_curve_on_virtual_clock():
+    print("\n--- Test: Virtual-Clock Capacity Curve ---")
+    workload = lambda: poisson_arrivals(1000, 0.1, etl_dag, seed=1)
+    reports = sweep(workload, [2, 8, 32], duration=lognormal(10.0, 0.5), failure_rate=0.02, seed=7)
+    small, medium, large = reports
+
+    # Hours of virtual time in (at most) seconds of wall time
+    assert small.makespan > 3600 and small.wall_seconds < 30
+    # 7 tasks per workflow reach the backend (the unchosen report is skipped), fewer after failures
+    assert small.tasks < 7000 and small.failed_tasks > 0
+    # More workers: less waiting, shorter makespan, lower utilization
+    assert small.mean_queue_delay > medium.mean_queue_delay > large.mean_queue_delay
+    assert small.makespan > medium.makespan >= large.makespan
+    assert small.utilization > 0.95 and large.utilization < 0.3
+
+    # Fully reproducible for a seed; a different seed samples differently
+    again = simulate(workload(), 8, duration=lognormal(10.0, 0.5), failure_rate=0.02, seed=7)
+    assert (again.makespan, again.mean_queue_delay, again.failed_tasks) == \
+           (medium.makespan, medium.mean_queue_delay, medium.failed_tasks)
+    other = simulate(workload(), 8, duration=lognormal(10.0, 0.5), failure_rate=0.02, seed=8)
+    assert other.makespan != medium.makespan
+    print(f">>> SUCCESS: {small.makespan:.0f}s of virtual time simulated in {small.wall_seconds:.2f}s, reproducibly")
+
+def test_policies_and_history_replay():
+    print("\n--- Test: Scheduling Policies and History Replay ---")
+    def tenant_dag(i):
+        # One tenant's 200-task backfill lands first, the other tenant's short run right after
+        dag = SimpleWorkflowDAG(f"{'backfill' if i == 0 else 'short'}_{i}")
+        dag.tenant = "backfill" if i == 0 else "short"
+        for k in range(200 if i == 0 else 2):
+            dag.add_task(PythonFunctionTask(f"T{k}", noop))
+        return dag
+
+    def short_run_finish(policy):
+        loop = VirtualClockLoop()
+        backend = SimulationBackend(4, fixed(1.0), policy=policy)
+        finished = {}
+
+        async def main():
+            engine = AdvancedWorkflowEngine(backend)
+            async def run(dag):
+                await engine.run(dag)
+                finished[dag.workflow_id] = loop.time()
+            await asyncio.gather(run(tenant_dag(0)), run(tenant_dag(1)))
+        try:
+            loop.run_until_complete(main())
+        finally:
+            loop.close()
+        return finished["short_1"]
+
+    # FIFO drains the backfill first; fair share interleaves the short tenant's tasks
+    assert short_run_finish("fifo") > 50
+    assert short_run_finish("fair_share") < 2
+
+    recorded = [{"tasks": [{"name": "Extract", "status": "completed", "duration": 4.0},
+                           {"name": "Load", "status": "failed", "duration": 2.0},
+                           {"name": "Load", "status": "completed", "duration": 2.0},
+                           {"name": "Pending", "status": "pending"}]}]
+    history = HistoryModel.from_executions(recorded)
+    assert history.failure_rate(PythonFunctionTask("Load", noop)) == 0.5
+    dag = SimpleWorkflowDAG("replay")
+    dag.add_dependency(PythonFunctionTask("Extract", noop), PythonFunctionTask("Unknown", noop))
+    report = simulate([(0.0, dag)], 1, duration=HistoryModel({"Extract": [4.0], "Load": [2.0]}))
+    # Extract replays its own duration; an unknown task samples from all recorded durations
+    assert report.makespan >= 6.0 and report.failed_tasks == 0
+    print(">>> SUCCESS: Policies compared and recorded history replayed")
+
+def test_history_from_api_executions():
+    print("\n--- Test: History Replay of GET /executions ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["PYTASKFLOW_JOURNAL"] = os.path.join(tmp, "journal.db")
+        from fastapi.testclient import TestClient
+        from app import main
+
+        request = {"id": "hist", "name": "hist", "description": "", "version": "1", "owner": "team-a",
+                   "tasks": [{"name": "Extract", "type": "python"},
+                             {"name": "Load", "type": "python", "dependencies": ["Extract"]}]}
+        with TestClient(main.app) as client:
+            execution_id = client.post("/workflows", json=request).json()["id"]
+            for _ in range(100):
+                executions = client.get("/executions").json()
+                if all(e["status"] in ("completed", "failed") for e in executions):
+                    break
+                time.sleep(0.1)
+        main.journal.close()
+
+    # The engine reports task starts, so executed tasks carry a duration
+    ran = [t for t in executions[0]["tasks"] if t["status"] in ("completed", "failed")]
+    assert executions[0]["id"] == execution_id and ran and all(t["duration"] > 0 for t in ran)
+    history = HistoryModel.from_executions(executions)
+    assert set(history.durations) == {t["name"] for t in ran}
+    report = simulate([(0.0, etl_dag(0))], 2, duration=history)
+    assert report.makespan > 0
+    print(f">>> SUCCESS: Replayed {len(ran)} recorded task durations from the API")
+
+if __name__ == "__main__":
+    test_capacity_curve_on_virtual_clock()
+    test_policies_and_history_replay()
+    test_history_from_api_executions()
@@ -0,0 +1,59 @@
+import asyncio
+import os
+import sys
+import tempfile
+
+# Ensure backend path is in sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.core.engine import AdvancedWorkflowEngine
+from app.core.backend import LocalExecutionBackend
+from app.core.task import PythonFunctionTask
+from app.core.dag import SimpleWorkflowDAG
+from app.core.logs import TaskLogging
+
+def chatty(c, p):
+    for i in range(p["lines"]):
+        c.log.info("%s line %d", p["tag"], i)
+    if p.get("fail"):
+        raise RuntimeError("bad input")
+    return p["tag"]
+
+async def test_per_task_capture_and_sink():
+    print("\n--- Test: Per-Task Log Capture ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        task_logging = TaskLogging(lines_per_task=5, log_dir=tmp)
+        task_logging.start()
+        followed = []
+        _, unsubscribe = task_logging.buffer.follow("logs_wf", "Quiet", followed.append)
+        try:
+            engine = AdvancedWorkflowEngine(LocalExecutionBackend(max_workers=4), batch_size=10)
+            dag = SimpleWorkflowDAG("logs_wf")
+            root = PythonFunctionTask("Root", chatty, {"tag": "root", "lines": 1})
+            dag.add_dependency(root, PythonFunctionTask("Loud", chatty, {"tag": "loud", "lines": 20}))
+            dag.add_dependency(root, PythonFunctionTask("Quiet", chatty, {"tag": "quiet", "lines": 2, "cheap": True}))
+            dag.add_dependency(root, PythonFunctionTask("Broken", chatty, {"tag": "broken", "lines": 1, "fail": True}))
+            await engine.run(dag)
+        finally:
+            unsubscribe()
+            task_logging.stop()
+
+        buffer = task_logging.buffer
+        # Each task only sees its own lines, bounded to the last lines_per_task
+        assert [m for _, _, m in buffer.tail("logs_wf", "Loud")] == [f"loud line {i}" for i in range(15, 20)]
+        assert [m for _, _, m in buffer.tail("logs_wf", "Loud", 2)] == ["loud line 18", "loud line 19"]
+        # Micro-batched tasks are attributed individually too
+        assert [m for _, _, m in buffer.tail("logs_wf", "Quiet")] == ["quiet line 0", "quiet line 1"]
+        assert [m for _, _, m in followed] == ["quiet line 0", "quiet line 1"]
+        assert buffer.tail("logs_wf", "Broken")[-1][1:] == ("ERROR", "Task Broken failed: bad input")
+
+        # The background sink wrote everything (the ring buffer bound does not apply)
+        with open(os.path.join(tmp, "tasks.log")) as f:
+            written = f.read()
+        assert written.count("[logs_wf/Loud]") == 20
+        assert "[logs_wf/Quiet] quiet line 1" in written
+        assert task_logging.metrics()["dropped"] == 0
+    print(">>> SUCCESS: Logs captured per task, followed live and written by the sink")
+
+if __name__ == "__main__":
+    asyncio.run(test_per_task_capture_and_sink())
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import sys
+
+# Ensure backend path is in sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.core.engine import AdvancedWorkflowEngine
+from app.core.backend import LocalExecutionBackend
+from app.core.task import PythonFunctionTask
+from app.core.extensions import BranchPythonTask
+from app.core.dag import SimpleWorkflowDAG
+from app.interfaces import TaskStatus
+from app.api.models import TaskConfig
+from pydantic import ValidationError
+
+class EventRecorder:
+    def __init__(self):
+        self.events = []
+    def update(self, event: str, data: any):
+        self.events.append((event, data))
+
+    def tasks(self, event):
+        return sorted(d["task"] for e, d in self.events if e == event)
+
+def done(name):
+    return PythonFunctionTask(name, lambda c, p: f"{name} Done")
+
+def boom(c, p):
+    raise RuntimeError("broken")
+
+async def test_branch_skip_propagation():
+    print("\n--- Test: Skip Propagation and Join Trigger Rules ---")
+    engine = AdvancedWorkflowEngine(LocalExecutionBackend(max_workers=2))
+    recorder = EventRecorder()
+    engine.attach(recorder)
+
+    #            /-> High -> High_Report
+    # Decide ---<
+    #            \-> Low -> Low_Report -> Low_Archive
+    # High_Report + Low_Report -> Join_All (all_success), Join_Any (none_failed)
+    dag = SimpleWorkflowDAG("skip_wf")
+    decide = BranchPythonTask("Decide", lambda c, p: ["High"])
+    high, high_report = done("High"), done("High_Report")
+    low, low_report, low_archive = done("Low"), done("Low_Report"), done("Low_Archive")
+    join_all = done("Join_All")
+    join_any = PythonFunctionTask("Join_Any", lambda c, p: sorted(c.task_results), {"trigger_rule": "none_failed"})
+    dag.add_dependency(decide, high)
+    dag.add_dependency(decide, low)
+    dag.add_dependency(high, high_report)
+    dag.add_dependency(low, low_report)
+    dag.add_dependency(low_report, low_archive)
+    for join in (join_all, join_any):
+        dag.add_dependency(high_report, join)
+        dag.add_dependency(low_report, join)
+
+    result = await asyncio.wait_for(engine.run(dag), timeout=10)
+    assert result.status == TaskStatus.COMPLETED
+    # The whole unchosen subtree is skipped, not left pending
+    assert recorder.tasks("task_skipped") == ["Join_All", "Low", "Low_Archive", "Low_Report"]
+    assert result.results["Join_Any"] == ["High_Report", "Low_Report"]
+    assert result.results["Low_Archive"] is None
+    print(">>> SUCCESS: Skips propagated; none_failed join ran after the branch")
+
+async def test_failure_propagation():
+    print("\n--- Test: Upstream Failure Propagation ---")
+    engine = AdvancedWorkflowEngine(LocalExecutionBackend(max_workers=2))
+    recorder = EventRecorder()
+    engine.attach(recorder)
+
+    # Extract -> Broken -> Load -> Publish; Broken + Backup -> Cleanup (all_done), Notify (one_success)
+    dag = SimpleWorkflowDAG("fail_wf")
+    extract, backup = done("Extract"), done("Backup")
+    broken = PythonFunctionTask("Broken", boom)
+    load, publish = done("Load"), done("Publish")
+    cleanup = PythonFunctionTask("Cleanup", lambda c, p: "cleaned", {"trigger_rule": "all_done"})
+    notify = PythonFunctionTask("Notify", lambda c, p: "notified", {"trigger_rule": "one_success"})
+    dag.add_dependency(extract, broken)
+    dag.add_dependency(broken, load)
+    dag.add_dependency(load, publish)
+    for task in (cleanup, notify):
+        dag.add_dependency(broken, task)
+        dag.add_dependency(backup, task)
+
+    result = await asyncio.wait_for(engine.run(dag), timeout=10)
+    assert result.status == TaskStatus.FAILED
+    assert recorder.tasks("task_failed") == ["Broken"]
+    assert recorder.tasks("task_upstream_failed") == ["Load", "Publish"]
+    assert result.results["Cleanup"] == "cleaned"
+    assert result.results["Notify"] == "notified"
+    assert [d["status"] for e, d in recorder.events if e == "workflow_completed"] == ["failed"]
+
+    # The API rejects unknown rules up front (422) instead of failing when the task is built
+    assert TaskConfig(name="Cleanup", type="python", params={"trigger_rule": "all_done"})
+    try:
+        TaskConfig(name="Cleanup", type="python", params={"trigger_rule": "bogus"})
+        assert False, "unknown trigger_rule should be rejected"
+    except ValidationError as e:
+        assert "trigger_rule" in str(e)
+    print(">>> SUCCESS: Failure marked descendants upstream_failed; all_done/one_success ran")
+
+if __name__ == "__main__":
+    asyncio.run(test_branch_skip_propagation())
+    asyncio.run(test_failure_propagation())